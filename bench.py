@@ -0,0 +1,192 @@
+"""
+Benchmark de CPU dos renderers trab3…trab6 contra o glstub (sem GPU).
+
+Para cada módulo: alguns frames parados em IDLE e depois a animação inteira
+até voltar para IDLE, um update() + render() por frame. Por estado sai:
+tempo de CPU por frame (média/p50/p95/máx), chamadas GL e draw calls por
+frame e memória alocada por frame (pico transitório e líquida, tracemalloc
+numa segunda passada para não distorcer o tempo).
+
+uso: python bench.py [trab4 trab6 ...] [--saida bench.json] [--base antigo.json]
+
+Com --base, imprime a variação de cada número em relação ao JSON antigo.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import traceback
+
+import numpy as np
+
+import glstub
+
+MODULOS     = ("trab3", "trab4", "trab5", "trab6")
+FRAMES_IDLE = 120
+MAX_FRAMES  = 50000
+DRAWS       = ("glDrawArrays", "glDrawElements", "glDrawArraysInstanced", "glDrawElementsInstanced",
+               "glBlitFramebuffer")   # a cópia da camada de fundo cobre a tela inteira
+
+
+def _inicia(app):
+    if hasattr(app, "inicia"):
+        app.inicia()
+    else:                                   # trab3 só tem a tecla
+        glfw = sys.modules["glfw"]
+        app.key_callback(app.window, glfw.KEY_SPACE, 0, glfw.PRESS, 0)
+
+
+def _frames(mod, app):
+    """Gera o estado (int) de cada frame e roda update()+render() depois do yield."""
+    for _ in range(FRAMES_IDLE):
+        yield mod.estadoAtual
+    _inicia(app)
+    for _ in range(MAX_FRAMES):
+        yield mod.estadoAtual
+        if mod.estadoAtual == mod.ESTADOS["IDLE"]:
+            return
+
+
+def _passo(app):
+    app.update()
+    app.render()
+
+
+# as medições vão para arrays alocados antes do loop: guardar em listas
+# alocaria dentro da própria medição de memória
+def _mede_tempo(mod, app):
+    m = np.zeros((FRAMES_IDLE + MAX_FRAMES, 4), dtype=np.int64)   # estado, ns, chamadas, draws
+    n = 0
+    for estado in _frames(mod, app):
+        glstub.zera()
+        t0 = time.perf_counter_ns()
+        _passo(app)
+        m[n, 1] = time.perf_counter_ns() - t0
+        m[n, 0] = estado
+        m[n, 2] = glstub.total()
+        m[n, 3] = sum(glstub.chamadas[d] for d in DRAWS)
+        n += 1
+    return m[:n]
+
+
+def _mede_memoria(mod, app):
+    # memória no início de cada frame e pico transitório dentro dele
+    m = np.zeros((FRAMES_IDLE + MAX_FRAMES + 1, 3), dtype=np.int64)  # estado, antes, pico
+    n = 0
+    tracemalloc.start()
+    try:
+        for estado in _frames(mod, app):
+            m[n, 1] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            _passo(app)
+            m[n, 2] = tracemalloc.get_traced_memory()[1]
+            m[n, 0] = estado
+            n += 1
+        m[n, 1] = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return m[:n + 1]
+
+
+def mede(nome):
+    """Resultado de um módulo (dict pronto para JSON)."""
+    # os print() dos módulos (trab3 escreve um por frame) não podem cair no
+    # stdout, onde vai o JSON
+    try:
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            mod = glstub.carrega(nome)
+            app = mod.Application()
+            if not app.init():
+                return {"erro": "Application.init() devolveu False"}
+            # aquecimento: caches de texto, malhas, buffers crescem aqui
+            for _ in _frames(mod, app):
+                _passo(app)
+            tempos  = _mede_tempo(mod, app)
+            memoria = _mede_memoria(mod, app)
+    except Exception as e:
+        return {"erro": f"{type(e).__name__}: {e}",
+                "traceback": traceback.format_exc(limit=3)}
+
+    pico    = memoria[:-1, 2] - memoria[:-1, 1]
+    liquido = np.diff(memoria[:, 1])          # o que sobrou de cada frame para o próximo
+    estados = {}
+    for nome_estado, cod in mod.ESTADOS.items():
+        sel = tempos[:, 0] == cod
+        if not sel.any():
+            continue
+        selm = memoria[:-1, 0] == cod
+        us = tempos[sel, 1] / 1000.0
+        estados[nome_estado] = {
+            "frames":              int(sel.sum()),
+            "cpu_us_media":        round(float(us.mean()), 2),
+            "cpu_us_p50":          round(float(np.percentile(us, 50)), 2),
+            "cpu_us_p95":          round(float(np.percentile(us, 95)), 2),
+            "cpu_us_max":          round(float(us.max()), 2),
+            "gl_chamadas_frame":   round(float(tempos[sel, 2].mean()), 2),
+            "draw_calls_frame":    round(float(tempos[sel, 3].mean()), 2),
+            "bytes_pico_frame":    round(float(pico[selm].mean()), 1),
+            "bytes_liquidos_frame": round(float(liquido[selm].mean()), 3),
+        }
+    total = len(tempos)
+    return {"frames": total,
+            "cpu_us_media": round(float(tempos[:, 1].mean()) / 1000.0, 2),
+            "bytes_liquidos_frame": round(float(liquido.mean()), 3),
+            "estados": estados}
+
+
+def compara(novo, base):
+    """Linhas de texto com a variação (%) de cada número em relação à base."""
+    saida = []
+    for nome, r in novo["modulos"].items():
+        b = base.get("modulos", {}).get(nome)
+        if not b or "estados" not in r or "estados" not in b:
+            continue
+        for estado, e in r["estados"].items():
+            be = b["estados"].get(estado)
+            if not be:
+                continue
+            partes = []
+            for chave in ("cpu_us_media", "gl_chamadas_frame", "draw_calls_frame", "bytes_pico_frame"):
+                if be.get(chave):
+                    partes.append(f"{chave} {100.0 * (e[chave] - be[chave]) / be[chave]:+.1f}%")
+            saida.append(f"{nome:6s} {estado:12s} " + "  ".join(partes))
+    return saida
+
+
+# ----------------------- Função main ----------------------- #
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos renderers com GL de mentira")
+    parser.add_argument("modulos", nargs="*", default=list(MODULOS))
+    parser.add_argument("--saida", default=None, help="grava o JSON neste arquivo (padrão: stdout)")
+    parser.add_argument("--base", default=None, help="JSON de uma rodada anterior para comparar")
+    args = parser.parse_args(argv)
+
+    resultado = {
+        "python": platform.python_version(),
+        "maquina": platform.machine(),
+        "sistema": platform.platform(),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "modulos": {nome: mede(nome) for nome in args.modulos},
+    }
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+    for nome, r in resultado["modulos"].items():
+        resumo = r["erro"] if "erro" in r else f"{r['frames']} frames, {r['cpu_us_media']:.1f} µs/frame"
+        print(f"{nome}: {resumo}", file=sys.stderr)
+    if args.base:
+        with open(args.base, encoding="utf-8") as f:
+            for linha in compara(resultado, json.load(f)):
+                print(linha, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
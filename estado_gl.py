@@ -0,0 +1,95 @@
+from OpenGL.GL import *
+import OpenGL.GL.shaders as shaders
+
+_DESCONHECIDO = object()     # estado ainda não visto (depois de chamadas GL "cruas")
+
+
+# ============================================================ #
+#                      Programa de shader                      #
+# ============================================================ #
+class Programa:
+    """Compila o programa e resolve as posições dos uniforms uma única vez."""
+    def __init__(self, vertex_src, fragment_src, uniforms=()):
+        self.id = shaders.compileProgram(
+            shaders.compileShader(vertex_src, GL_VERTEX_SHADER),
+            shaders.compileShader(fragment_src, GL_FRAGMENT_SHADER)
+        )
+        self.loc = {nome: glGetUniformLocation(self.id, nome) for nome in uniforms}
+
+
+# ============================================================ #
+#                      Cache de estado GL                      #
+# ============================================================ #
+class EstadoGL:
+    """
+    Guarda programa, VAO, buffers e texturas ligados e só chama o GL quando
+    o valor muda. emitidas/elididas contam as trocas feitas e as puladas;
+    novo_frame() guarda o par do frame que acabou em ultimo_frame.
+    Buffers, VAOs, texturas e FBOs criados por gera() e apagados por apaga()
+    dão `objetos`, quantos estão vivos agora (não é zerado em invalida()).
+    """
+    def __init__(self):
+        self.objetos      = 0
+        self.emitidas     = 0
+        self.elididas     = 0
+        self.ultimo_frame = (0, 0)
+        self.invalida()
+
+    def invalida(self):
+        # chamar depois de código que liga coisas direto no GL (init_buffers etc.)
+        self.programa = _DESCONHECIDO
+        self.vao      = _DESCONHECIDO
+        self.unidade  = _DESCONHECIDO
+        self.buffers  = {}
+        self.texturas = {}
+
+    def novo_frame(self):
+        self.ultimo_frame = (self.emitidas, self.elididas)
+        self.emitidas = self.elididas = 0
+
+    def usa_programa(self, programa):
+        if programa == self.programa:
+            self.elididas += 1
+            return
+        glUseProgram(programa)
+        self.programa = programa
+        self.emitidas += 1
+
+    def liga_vao(self, vao):
+        if vao == self.vao:
+            self.elididas += 1
+            return
+        glBindVertexArray(vao)
+        self.vao = vao
+        self.emitidas += 1
+
+    def liga_buffer(self, alvo, buffer):
+        if self.buffers.get(alvo, _DESCONHECIDO) == buffer:
+            self.elididas += 1
+            return
+        glBindBuffer(alvo, buffer)
+        self.buffers[alvo] = buffer
+        self.emitidas += 1
+
+    def liga_textura(self, unidade, textura):
+        if self.texturas.get(unidade, _DESCONHECIDO) == textura:
+            self.elididas += 1
+            return
+        if unidade != self.unidade:
+            glActiveTexture(GL_TEXTURE0 + unidade)
+            self.unidade = unidade
+            self.emitidas += 1
+        glBindTexture(GL_TEXTURE_2D, textura)
+        self.texturas[unidade] = textura
+        self.emitidas += 1
+
+    # ------------------- objetos ------------------- #
+    def gera(self, gl_gen, n=1):
+        """gl_gen(n) (glGenBuffers, glGenTextures…) contando os objetos criados."""
+        ids = gl_gen(n)
+        self.objetos += n
+        return ids
+
+    def apaga(self, gl_delete, ids):
+        gl_delete(len(ids), ids)
+        self.objetos -= len(ids)
@@ -0,0 +1,421 @@
+"""
+Exporta a animação inteira (IDLE → … → IDLE) como PNGs numerados.
+
+O render não espera a GPU nem o disco:
+  - a leitura do FBO vai para um anel de pixel buffer objects (PBO) e só é
+    mapeada ATRASO quadros depois, quando a cópia já terminou;
+  - compressão (zlib, que solta o GIL) e escrita ficam num pool de threads
+    alimentado por uma fila limitada; os buffers de quadro são reaproveitados,
+    então a memória não cresce com o tamanho da animação.
+
+Com --formato y4m/apng sai um arquivo só (ver video.py).
+Com --processos N a linha do tempo é dividida em blocos renderizados em
+paralelo, cada processo com seu próprio contexto offscreen.
+
+    python exporta.py trab6 saida/ --backend egl
+"""
+import argparse
+import ctypes
+import multiprocessing
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+
+import numpy as np
+
+import offscreen
+
+ATRASO_PADRAO = 2     # quadros entre pedir a leitura e mapear o PBO
+FILA_PADRAO   = 16    # quadros esperando compressão (limita a memória)
+NIVEL_PADRAO  = 1     # zlib: 1 = rápido … 9 = menor (6 dá PNGs ~2x menores, ~2.5x mais lento)
+BLOCO_PADRAO  = 500   # quadros por tarefa no modo paralelo
+QUADROS_POR_SEGUNDO = 60   # ritmo da animação (passo fixo de 1/60 s)
+
+ASSINATURA_PNG = b"\x89PNG\r\n\x1a\n"
+
+
+# ============================================================ #
+#                         PNG (só zlib)                        #
+# ============================================================ #
+def chunk_png(tipo, dados):
+    return struct.pack(">I", len(dados)) + tipo + dados + struct.pack(">I", zlib.crc32(dados, zlib.crc32(tipo)))
+
+
+def linhas_png(largura, altura):
+    """Buffer de scanlines PNG (byte de filtro 0 + RGB) para um quadro."""
+    return np.zeros((altura, 1 + largura * 3), dtype=np.uint8)
+
+
+def preenche_linhas(linhas, quadro):
+    # o alfa do FBO não é 1 nas bordas do texto (blending); a tela ignora, o arquivo não
+    linhas[:, 1:] = quadro[..., :3].reshape(len(linhas), -1)
+
+
+def codifica_png(linhas, largura, altura, nivel=NIVEL_PADRAO):
+    """PNG RGB 8 bits a partir de um buffer de linhas_png() já preenchido."""
+    cabecalho = struct.pack(">IIBBBBB", largura, altura, 8, 2, 0, 0, 0)
+    return (ASSINATURA_PNG
+            + chunk_png(b"IHDR", cabecalho)
+            + chunk_png(b"IDAT", zlib.compress(linhas, nivel))
+            + chunk_png(b"IEND", b""))
+
+
+# ============================================================ #
+#                    Leitura assíncrona (PBO)                  #
+# ============================================================ #
+class LeitorPBO:
+    """
+    Anel de ATRASO+1 PBOs. pede() dispara a cópia do FBO para um PBO livre
+    e volta na hora; coleta() mapeia o pedido mais antigo (ATRASO quadros
+    atrás, já pronto) e copia os pixels, virados, para o buffer de linhas.
+    """
+    def __init__(self, largura, altura, atraso=ATRASO_PADRAO):
+        from OpenGL.GL import (glGenBuffers, glBindBuffer, glBufferData, glPixelStorei,
+                               GL_PIXEL_PACK_BUFFER, GL_STREAM_READ, GL_PACK_ALIGNMENT)
+        self.largura, self.altura = largura, altura
+        self.atraso   = atraso
+        self.tamanho  = largura * altura * 3     # só RGB, linhas sem preenchimento
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        self.pbos     = [glGenBuffers(1) for _ in range(atraso + 1)]
+        for pbo in self.pbos:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self.tamanho, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.livres    = list(self.pbos)
+        self.pendentes = deque()          # (pbo, índice do quadro), do mais antigo ao mais novo
+
+    def cheio(self):
+        return len(self.pendentes) > self.atraso
+
+    def pede(self, indice):
+        from OpenGL.GL import (glBindBuffer, glReadPixels, GL_PIXEL_PACK_BUFFER,
+                               GL_RGB, GL_UNSIGNED_BYTE)
+        pbo = self.livres.pop()
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        glReadPixels(0, 0, self.largura, self.altura, GL_RGB, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.pendentes.append((pbo, indice))
+
+    def coleta(self, linhas):
+        """Copia o pedido mais antigo para linhas (de linhas_png) e devolve o índice."""
+        from OpenGL.GL import (glBindBuffer, glMapBufferRange, glUnmapBuffer,
+                               GL_PIXEL_PACK_BUFFER, GL_MAP_READ_BIT)
+        pbo, indice = self.pendentes.popleft()
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        ptr = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, self.tamanho, GL_MAP_READ_BIT)
+        origem = np.ctypeslib.as_array(ctypes.cast(ptr, ctypes.POINTER(ctypes.c_ubyte)),
+                                       shape=(self.altura, self.largura * 3))
+        linhas[:, 1:] = origem[::-1]       # GL entrega de baixo para cima
+        glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.livres.append(pbo)
+        return indice
+
+    def apaga(self):
+        from OpenGL.GL import glDeleteBuffers
+        glDeleteBuffers(len(self.pbos), self.pbos)
+
+
+# ============================================================ #
+#                  Compressão + escrita em threads             #
+# ============================================================ #
+class GravadorPNG:
+    """
+    Pool de threads que comprime e grava quadros. buffer() pega um buffer
+    livre (espera se todos estiverem em uso: é o limite de memória), e o
+    render preenche e devolve com entrega(). fecha() espera a fila esvaziar.
+    """
+    def __init__(self, pasta, largura, altura, trabalhadores=None,
+                 fila=FILA_PADRAO, nivel=NIVEL_PADRAO, prefixo="quadro"):
+        os.makedirs(pasta, exist_ok=True)
+        self.pasta, self.prefixo = pasta, prefixo
+        self.largura, self.altura, self.nivel = largura, altura, nivel
+        self.trabalhadores = trabalhadores or os.cpu_count() or 1
+        self.fila   = queue.Queue(maxsize=fila)
+        self.livres = queue.Queue()
+        for _ in range(fila + self.trabalhadores + 1):
+            self.livres.put(linhas_png(largura, altura))
+        self.erro    = None
+        self.escritos = 0
+        self._trava  = threading.Lock()
+        self.threads = [threading.Thread(target=self._trabalha, daemon=True)
+                        for _ in range(self.trabalhadores)]
+        for t in self.threads:
+            t.start()
+
+    def buffer(self):
+        return self.livres.get()
+
+    def devolve(self, linhas):
+        # quadro descartado (repetido): o buffer volta sem passar pela fila
+        self.livres.put(linhas)
+
+    def nome(self, indice):
+        return f"{self.prefixo}_{indice:05d}.png"
+
+    def entrega(self, indice, linhas):
+        if self.erro:
+            raise self.erro
+        self.fila.put((indice, linhas))
+
+    def _trabalha(self):
+        while True:
+            item = self.fila.get()
+            if item is None:
+                return
+            indice, linhas = item
+            try:
+                dados = codifica_png(linhas, self.largura, self.altura, self.nivel)
+                nome = os.path.join(self.pasta, self.nome(indice))
+                with open(nome, "wb") as f:
+                    f.write(dados)
+                with self._trava:
+                    self.escritos += 1
+            except Exception as e:       # guarda o primeiro erro; o render relança
+                self.erro = self.erro or e
+            finally:
+                self.livres.put(linhas)
+
+    def fecha(self):
+        for _ in self.threads:
+            self.fila.put(None)
+        for t in self.threads:
+            t.join()
+        if self.erro:
+            raise self.erro
+
+
+# ============================================================ #
+#                  Lista de duração (ffconcat)                 #
+# ============================================================ #
+class ListaConcat:
+    """
+    Com deduplicação só os quadros distintos viram PNG; esta lista diz quanto
+    tempo cada um fica na tela, no formato do demuxer concat do ffmpeg:
+        ffmpeg -f concat -i quadros.ffconcat saida.mp4
+    Fica um item pendente (o último quadro distinto) até saber a duração.
+    """
+    def __init__(self, caminho, fps=QUADROS_POR_SEGUNDO):
+        self.arq = open(caminho, "w", encoding="utf-8")
+        self.arq.write("ffconcat version 1.0\n")
+        self.fps = fps
+        self.pendente = None
+        self.repeticoes = 0
+
+    def _grava(self):
+        self.arq.write(f"file '{self.pendente}'\nduration {self.repeticoes / self.fps:.6f}\n")
+
+    def quadro(self, nome):
+        if self.pendente is not None:
+            self._grava()
+        self.pendente, self.repeticoes = nome, 1
+
+    def repete(self):
+        self.repeticoes += 1
+
+    def fecha(self):
+        if self.pendente is not None:
+            self._grava()
+            self.arq.write(f"file '{self.pendente}'\n")   # o concat ignora a duração do último item
+        self.arq.close()
+
+
+# ============================================================ #
+#                           Exportação                         #
+# ============================================================ #
+def exporta(pasta, modulo="trab6", backend="egl", atraso=ATRASO_PADRAO,
+            trabalhadores=None, fila=FILA_PADRAO, nivel=NIVEL_PADRAO, limite=None,
+            dedup=False):
+    """
+    Renderiza sem janela e grava todos os quadros. Devolve (quadros, segundos,
+    colapsados). Com dedup, um quadro igual ao anterior não vira arquivo: só
+    aumenta a duração do anterior em quadros.ffconcat.
+    """
+    h = offscreen.Headless(modulo, backend)
+    leitor = LeitorPBO(h.fbo.largura, h.fbo.altura, atraso)
+    gravador = GravadorPNG(pasta, h.fbo.largura, h.fbo.altura, trabalhadores, fila, nivel)
+    # comparação exata com uma cópia do último quadro distinto: mais barata
+    # que um hash do quadro inteiro e sem risco de colisão
+    anterior = linhas_png(h.fbo.largura, h.fbo.altura) if dedup else None
+    lista = ListaConcat(os.path.join(pasta, "quadros.ffconcat")) if dedup else None
+    n = colapsados = 0
+
+    def descarrega():
+        nonlocal colapsados
+        linhas = gravador.buffer()
+        indice = leitor.coleta(linhas)
+        if dedup:
+            if lista.pendente is not None and np.array_equal(linhas, anterior):
+                gravador.devolve(linhas)
+                lista.repete()
+                colapsados += 1
+                return
+            np.copyto(anterior, linhas)
+            lista.quadro(gravador.nome(indice))
+        gravador.entrega(indice, linhas)
+
+    t0 = time.perf_counter()
+    try:
+        for indice in h.renderiza(limite):
+            leitor.pede(indice)
+            if leitor.cheio():
+                descarrega()
+            n += 1
+        while leitor.pendentes:          # os ATRASO últimos quadros
+            descarrega()
+    finally:
+        gravador.fecha()
+        if lista:
+            lista.fecha()
+        leitor.apaga()
+        h.fecha()
+    return n, time.perf_counter() - t0, colapsados
+
+
+def exporta_sincrono(pasta, modulo="trab6", backend="egl", nivel=NIVEL_PADRAO, limite=None):
+    """Versão ingênua (glReadPixels + PNG no próprio loop), só para comparar."""
+    h = offscreen.Headless(modulo, backend)
+    os.makedirs(pasta, exist_ok=True)
+    linhas = linhas_png(h.fbo.largura, h.fbo.altura)
+    n = 0
+    t0 = time.perf_counter()
+    try:
+        for indice, quadro in enumerate(h.quadros(limite, copia=False)):
+            preenche_linhas(linhas, quadro)
+            with open(os.path.join(pasta, f"quadro_{indice:05d}.png"), "wb") as f:
+                f.write(codifica_png(linhas, h.fbo.largura, h.fbo.altura, nivel))
+            n += 1
+    finally:
+        h.fecha()
+    return n, time.perf_counter() - t0, 0
+
+
+def exporta_video(caminho, modulo="trab6", backend="egl", formato="apng",
+                  nivel=NIVEL_PADRAO, limite=None, dedup=False):
+    """
+    Grava a animação num único arquivo .y4m ou .apng, quadro a quadro.
+    dedup só vale para APNG (o Y4M tem taxa de quadros fixa).
+    """
+    import video
+    h = offscreen.Headless(modulo, backend)
+    if formato == "apng":
+        escritor = video.EscritorAPNG(caminho, h.fbo.largura, h.fbo.altura,
+                                      QUADROS_POR_SEGUNDO, nivel, dedup)
+    else:
+        escritor = video.FORMATOS[formato](caminho, h.fbo.largura, h.fbo.altura,
+                                           QUADROS_POR_SEGUNDO)
+    t0 = time.perf_counter()
+    try:
+        for quadro in h.quadros(limite, copia=False):
+            escritor.escreve(quadro)
+    finally:
+        escritor.fecha()
+        h.fecha()
+    colapsados = getattr(escritor, "colapsados", 0)
+    return escritor.quadros + colapsados, time.perf_counter() - t0, colapsados
+
+
+# ============================================================ #
+#                 Blocos em paralelo (processos)               #
+# ============================================================ #
+_headless = None     # contexto + Application do processo trabalhador
+_linhas   = None
+
+
+def _inicia_processo(modulo, backend):
+    global _headless, _linhas
+    offscreen.prepara(backend)
+    _headless = offscreen.Headless(modulo, backend)
+    _linhas = linhas_png(_headless.fbo.largura, _headless.fbo.altura)
+
+
+def _conta_quadros():
+    return _headless.total_quadros()
+
+
+def _renderiza_bloco(tarefa):
+    # a simulação vai ao início do bloco sem desenhar (direto, com linha do
+    # tempo) e cada quadro é gravado com o índice global: a ordem sai dos nomes
+    pasta, inicio, fim, nivel = tarefa
+    h = _headless
+    n = 0
+    for indice in h.renderiza(fim, inicio):
+        preenche_linhas(_linhas, h.fbo.le())
+        with open(os.path.join(pasta, f"quadro_{indice:05d}.png"), "wb") as f:
+            f.write(codifica_png(_linhas, h.fbo.largura, h.fbo.altura, nivel))
+        n += 1
+    return n
+
+
+def exporta_paralelo(pasta, modulo="trab6", backend="egl", processos=None,
+                     bloco=BLOCO_PADRAO, nivel=NIVEL_PADRAO, limite=None):
+    """Divide a animação em blocos de quadros e renderiza num pool de processos."""
+    os.makedirs(pasta, exist_ok=True)
+    processos = processos or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    # spawn: cada processo cria o próprio contexto GL (fork herdaria estado do driver)
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(processos, _inicia_processo, (modulo, backend)) as pool:
+        total = pool.apply(_conta_quadros)
+        if limite is not None:
+            total = min(total, limite)
+        blocos = [(pasta, a, min(a + bloco, total), nivel) for a in range(0, total, bloco)]
+        n = sum(pool.imap_unordered(_renderiza_bloco, blocos))
+    return n, time.perf_counter() - t0, 0
+
+
+# ----------------------- Função main ----------------------- #
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta a animação como PNGs")
+    parser.add_argument("modulo", nargs="?", default="trab6", help="trab4, trab5 ou trab6")
+    parser.add_argument("pasta", nargs="?", default="quadros", help="pasta dos PNGs ou arquivo .y4m/.apng")
+    parser.add_argument("--formato", choices=("png", "y4m", "apng"), default="png",
+                        help="png = um arquivo por quadro; y4m/apng = um arquivo só")
+    parser.add_argument("--backend", choices=offscreen.BACKENDS, default="egl")
+    parser.add_argument("--atraso", type=int, default=ATRASO_PADRAO, help="quadros de atraso do anel de PBOs")
+    parser.add_argument("--trabalhadores", type=int, default=None, help="threads de compressão (padrão: nº de CPUs)")
+    parser.add_argument("--fila", type=int, default=FILA_PADRAO, help="quadros esperando compressão")
+    parser.add_argument("--nivel", type=int, default=NIVEL_PADRAO, help="nível do zlib (1–9)")
+    parser.add_argument("--quadros", type=int, default=None, help="para depois de N quadros")
+    parser.add_argument("--sincrono", action="store_true", help="leitura e PNG no próprio loop (comparação)")
+    parser.add_argument("--dedup", action="store_true",
+                        help="quadro igual ao anterior vira duração, não arquivo (png e apng)")
+    parser.add_argument("--processos", type=int, default=None,
+                        help="renderiza blocos da animação em N processos")
+    parser.add_argument("--bloco", type=int, default=BLOCO_PADRAO, help="quadros por bloco (com --processos)")
+    args = parser.parse_args(argv)
+    # só o caminho com PBOs (png) e o APNG sabem colapsar quadros repetidos
+    if args.dedup and args.formato == "y4m":
+        parser.error("--dedup não vale para y4m (taxa de quadros fixa)")
+    if args.dedup and args.formato == "png" and (args.processos or args.sincrono):
+        parser.error("--dedup não vale com --processos nem com --sincrono")
+
+    offscreen.prepara(args.backend)
+    if args.formato != "png":
+        n, dt, colapsados = exporta_video(args.pasta, args.modulo, args.backend, args.formato,
+                                          args.nivel, args.quadros, args.dedup)
+    elif args.processos:
+        n, dt, colapsados = exporta_paralelo(args.pasta, args.modulo, args.backend, args.processos,
+                                 args.bloco, args.nivel, args.quadros)
+    elif args.sincrono:
+        n, dt, colapsados = exporta_sincrono(args.pasta, args.modulo, args.backend, args.nivel, args.quadros)
+    else:
+        n, dt, colapsados = exporta(args.pasta, args.modulo, args.backend, args.atraso,
+                                    args.trabalhadores, args.fila, args.nivel, args.quadros,
+                                    args.dedup)
+    real = n / QUADROS_POR_SEGUNDO
+    print(f"{args.modulo}: {n} quadros em {dt:.2f} s = {n / dt:.0f} quadros/s "
+          f"({real / dt:.1f}x o tempo real)")
+    if args.dedup:
+        print(f"  {colapsados} quadros repetidos colapsados ({100 * colapsados / max(n, 1):.0f}%), "
+              f"{n - colapsados} gravados")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
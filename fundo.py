@@ -0,0 +1,80 @@
+from OpenGL.GL import *
+from estado_gl import EstadoGL
+
+
+# ============================================================ #
+#                Camada de fundo em textura (FBO)              #
+# ============================================================ #
+class FundoCache:
+    """
+    Camada que quase nunca muda desenhada numa textura (FBO) e copiada para
+    a tela inteira a cada frame: o preenchimento das formas dela só é pago
+    quando a camada é refeita. `chave` descreve o conteúdo guardado; quem
+    usa compara com o que quer mostrar e, se mudou, redesenha entre
+    comeca() e termina().
+
+    A cópia é um glBlitFramebuffer do mesmo tamanho, pixel a pixel (alfa
+    incluso), e não um quad com shader: no GL por software (llvmpipe) o
+    quad de tela cheia custava mais que o glClear + formas que ele troca.
+
+    comeca() guarda o FBO ligado para desenho (a janela, ou o FBO do
+    Headless) e a viewport e termina() devolve os dois; desenha() mexe só
+    no FBO de leitura e também o devolve.
+    """
+    def __init__(self, estado=None):
+        self.estado   = estado or EstadoGL()
+        self.fbo      = None
+        self.textura  = None
+        self.tamanho  = (0, 0)
+        self.chave    = None       # conteúdo atual da camada (None = nada ainda)
+        self.refeita  = 0          # quantas vezes a camada foi redesenhada
+        self.draw_calls = 0        # acumulado; quem mede zera
+        self._anterior  = None     # (FBO de desenho, viewport) de antes do comeca()
+
+    def init_gl(self):
+        self.textura = self.estado.gera(glGenTextures)
+        self.fbo     = self.estado.gera(glGenFramebuffers)
+        self.tamanho = (0, 0)
+        self.chave   = None
+
+    def _aloca(self, largura, altura):
+        # (re)cria a textura no tamanho novo; chamado com o FBO da camada ligado
+        self.estado.liga_textura(0, self.textura)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, largura, altura, 0, GL_RGBA, GL_UNSIGNED_BYTE, None)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)   # sem mipmaps
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glFramebufferTexture2D(GL_DRAW_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, self.textura, 0)
+        if glCheckFramebufferStatus(GL_DRAW_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError("framebuffer da camada de fundo incompleto")
+        self.tamanho = (largura, altura)
+
+    # ------------------- refazer ------------------- #
+    def comeca(self, largura, altura):
+        """Passa a desenhar na camada (realocada se o tamanho mudou)."""
+        anterior = int(glGetIntegerv(GL_DRAW_FRAMEBUFFER_BINDING))
+        viewport = tuple(int(v) for v in glGetIntegerv(GL_VIEWPORT))
+        self._anterior = (anterior, viewport)
+        glBindFramebuffer(GL_DRAW_FRAMEBUFFER, self.fbo)
+        if (largura, altura) != self.tamanho:
+            self._aloca(largura, altura)
+        glViewport(0, 0, largura, altura)
+
+    def termina(self, chave):
+        """Volta ao FBO e à viewport de antes; a camada agora mostra `chave`."""
+        fbo, viewport = self._anterior
+        glBindFramebuffer(GL_DRAW_FRAMEBUFFER, fbo)
+        glViewport(*viewport)
+        self._anterior = None
+        self.chave = chave
+        self.refeita += 1
+
+    # ------------------- por frame ------------------- #
+    def desenha(self):
+        """Cobre a tela inteira com a camada (substitui o glClear)."""
+        leitura = int(glGetIntegerv(GL_READ_FRAMEBUFFER_BINDING))   # o Headless lê do FBO dele
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, self.fbo)
+        largura, altura = self.tamanho
+        glBlitFramebuffer(0, 0, largura, altura, 0, 0, largura, altura,
+                          GL_COLOR_BUFFER_BIT, GL_NEAREST)
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, leitura)
+        self.draw_calls += 1
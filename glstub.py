@@ -0,0 +1,150 @@
+"""
+GL/GLFW de mentira para rodar Renderer e Application sem janela nem GPU.
+
+instala() precisa rodar ANTES de importar os trab*.py: ele registra em
+sys.modules os módulos OpenGL.GL, OpenGL.GL.shaders e glfw com funções que
+não fazem nada além de contar quantas vezes foram chamadas.
+"""
+import itertools
+import os
+import re
+import sys
+import time
+import types
+from collections import Counter
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+
+# quantas vezes cada função GL foi chamada desde o último zera()
+chamadas = Counter()
+
+_ids = itertools.count(1)
+_RETORNOS = {
+    "glGetUniformLocation": 0,
+    "glGetString": b"stub",
+    "glGetError": 0,
+    "glCheckFramebufferStatus": 0x8CD5,   # GL_FRAMEBUFFER_COMPLETE
+    "glfw.init": True,
+    "glfw.window_should_close": False,
+    "glfw.get_time": None,                # tratado à parte (relógio real)
+}
+
+
+def zera():
+    chamadas.clear()
+
+
+def total():
+    return sum(chamadas.values())
+
+
+def _nomes_usados():
+    # tudo que os fontes do projeto chamam de gl* / GL_* (o "from ... import *" precisa dos nomes)
+    nomes = set()
+    for arq in os.listdir(PASTA):
+        if arq.endswith(".py") and arq != os.path.basename(__file__):
+            with open(os.path.join(PASTA, arq), encoding="utf-8") as f:
+                nomes.update(re.findall(r"\b(gl[A-Z]\w*|GL_\w+)\b", f.read()))
+    return nomes
+
+
+def _funcao(nome, retorno):
+    def f(*args, **kwargs):
+        chamadas[nome] += 1
+        return retorno
+    f.__name__ = nome
+    return f
+
+
+def _get_integerv(gl):
+    # binding de FBO etc.: 0; GL_VIEWPORT: 4 valores
+    def glGetIntegerv(pname, *args):
+        chamadas["glGetIntegerv"] += 1
+        return [0, 0, 0, 0] if pname == gl.GL_VIEWPORT else 0
+    return glGetIntegerv
+
+
+def _gen(nome):
+    def f(n=1, *args):
+        chamadas[nome] += 1
+        if n == 1:
+            return next(_ids)
+        return [next(_ids) for _ in range(n)]
+    f.__name__ = nome
+    return f
+
+
+def _novo_id(nome):
+    # objetos criados de outro jeito (programa, janela): sempre um id novo
+    def f(*args, **kwargs):
+        chamadas[nome] += 1
+        return next(_ids)
+    f.__name__ = nome
+    return f
+
+
+class _ModuloFalso(types.ModuleType):
+    # qualquer atributo desconhecido vira constante (int único) ou função no-op
+    def __getattr__(self, nome):
+        if nome.startswith("__"):
+            raise AttributeError(nome)
+        if nome.isupper() or nome[:1].isupper():
+            valor = next(_ids)
+        else:
+            chave = f"{self.__name__}.{nome}"
+            if nome == "get_time":
+                valor = time.perf_counter
+            else:
+                valor = _funcao(chave, _RETORNOS.get(chave))
+        setattr(self, nome, valor)
+        return valor
+
+
+def instala():
+    if "OpenGL.GL" in sys.modules and getattr(sys.modules["OpenGL.GL"], "_stub", False):
+        return
+    gl = _ModuloFalso("OpenGL.GL")
+    gl._stub = True
+    nomes = sorted(_nomes_usados())
+    for nome in nomes:
+        if nome.startswith("GL_"):
+            setattr(gl, nome, next(_ids))
+        elif nome.startswith(("glGen", "glCreate")):
+            setattr(gl, nome, _gen(nome))
+        else:
+            setattr(gl, nome, _funcao(nome, _RETORNOS.get(nome)))
+    gl.glGetIntegerv = _get_integerv(gl)
+    gl.GL_FRAMEBUFFER_COMPLETE = _RETORNOS["glCheckFramebufferStatus"]   # FBO sempre completo
+    gl.__all__ = nomes
+
+    sh = _ModuloFalso("OpenGL.GL.shaders")
+    sh.compileShader  = _funcao("compileShader", 0)
+    sh.compileProgram = _novo_id("compileProgram")
+    gl.shaders = sh
+
+    ogl = _ModuloFalso("OpenGL")
+    ogl.GL = gl
+    sys.modules.update({"OpenGL": ogl, "OpenGL.GL": gl, "OpenGL.GL.shaders": sh})
+
+    glfw = _ModuloFalso("glfw")
+    glfw.init          = _funcao("glfw.init", True)
+    glfw.create_window = _novo_id("glfw.create_window")
+    sys.modules["glfw"] = glfw
+
+    # trab5/trab6 importam pygame sem usar; sem ele instalado basta um módulo vazio
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    try:
+        import pygame.freetype  # noqa: F401
+    except ImportError:
+        pg = _ModuloFalso("pygame")
+        pg.freetype = _ModuloFalso("pygame.freetype")
+        sys.modules.update({"pygame": pg, "pygame.freetype": pg.freetype})
+
+
+def carrega(nome):
+    """Importa trab*.py com o stub instalado (módulo novo a cada chamada)."""
+    import importlib
+    instala()
+    sys.path.insert(0, PASTA)
+    sys.modules.pop(nome, None)
+    return importlib.import_module(nome)
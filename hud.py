@@ -0,0 +1,139 @@
+"""
+HUD de desempenho: FPS, gráfico dos tempos de frame e divisão do frame em
+eventos / update / render / swap, mais draw calls e objetos GL.
+
+MedidorFrames guarda os últimos AMOSTRAS frames num anel de tamanho fixo
+(numpy, nada cresce). O HUD desenha pelo lote do Renderer: o gráfico inteiro
+é um bloco de quads submetido de uma vez (adiciona_varios) e sai na mesma
+chamada de desenho do resto; o texto só é refeito TEXTO_HZ vezes por
+segundo, e as três linhas saem numa malha só, do cache do TextoGL, numa
+única chamada de desenho.
+"""
+import time
+
+import numpy as np
+
+from lote import QUAD
+
+AMOSTRAS  = 240                 # ~4 s a 60 Hz
+FASES     = ("poll", "upd", "rend", "swap")   # eventos, update, render, swap_buffers
+TEXTO_HZ  = 2.0
+DESENHISTAS = ("fundo", "lote", "cena", "texto", "pacotes")   # atributos do Renderer que contam draw_calls
+
+# layout (canto inferior esquerdo, coordenadas da janela)
+X0, Y0      = 10, 10
+LARGURA     = 470
+ALT_GRAFICO = 60
+MS_TOPO     = 50.0              # ms no topo do gráfico
+ALT_LINHA   = 26
+
+COR_FUNDO   = (0.0, 0.0, 0.0, 0.65)
+COR_TEXTO   = (1.0, 1.0, 1.0)
+COR_ALVO    = (1.0, 1.0, 1.0, 0.35)          # linha de 16.7 ms
+CORES_BARRA = np.array([[0.2, 0.9, 0.2, 1.0],   # ≤ 1 frame de 60 Hz
+                        [1.0, 0.8, 0.1, 1.0],   # ≤ 2 frames
+                        [1.0, 0.2, 0.2, 1.0]],  # mais: engasgo
+                       dtype=np.float32)
+CORES_FASES = ((0.5, 0.5, 1.0, 1.0), (0.3, 0.9, 0.9, 1.0),
+               (1.0, 0.6, 0.2, 1.0), (0.7, 0.7, 0.7, 1.0))
+
+
+# ============================================================ #
+#                   Tempos dos últimos frames                  #
+# ============================================================ #
+class MedidorFrames:
+    """Anel com (intervalo entre frames, eventos, update, render, swap) em segundos."""
+    def __init__(self, capacidade=AMOSTRAS):
+        self.tempos = np.zeros((capacidade, 1 + len(FASES)), dtype=np.float64)
+        self.pos    = 0
+        self.n      = 0
+        self._inicio_ant = None
+
+    def registra(self, inicio, eventos, update, render, swap):
+        linha = self.tempos[self.pos]
+        linha[0] = inicio - self._inicio_ant if self._inicio_ant is not None else 0.0
+        linha[1], linha[2], linha[3], linha[4] = eventos, update, render, swap
+        self._inicio_ant = inicio
+        self.pos = (self.pos + 1) % len(self.tempos)
+        self.n = min(self.n + 1, len(self.tempos))
+
+    def intervalos(self):
+        """Intervalos (s) do mais antigo ao mais novo."""
+        idx = (self.pos - self.n + np.arange(self.n)) % len(self.tempos)
+        return self.tempos[idx, 0]
+
+    def medias(self):
+        return self.tempos[:self.n].mean(axis=0) if self.n else self.tempos[0]
+
+    def fps(self):
+        total = self.tempos[:self.n, 0].sum()
+        return self.n / total if total > 0 else 0.0
+
+
+# ============================================================ #
+#                              HUD                             #
+# ============================================================ #
+class HUD:
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.linhas   = ("", "", "")
+        self._bloco   = ()                   # (x, y, texto) das linhas, chave da malha do TextoGL
+        self.proximo_texto = 0.0
+        self._draws_ant = 0
+        self.draws  = 0                      # draw calls do último frame
+        passo = LARGURA / AMOSTRAS
+        self._xs = X0 + passo * (np.arange(AMOSTRAS) + 0.5)
+        self._larg_barra = max(passo - 0.5, 1.0)
+
+    def _conta_draws(self):
+        r = self.renderer
+        total = sum(getattr(r, nome).draw_calls for nome in DESENHISTAS if hasattr(r, nome))
+        self.draws, self._draws_ant = total - self._draws_ant, total
+
+    def _atualiza_texto(self, medidor, objetos_gl):
+        m = medidor.medias() * 1000.0
+        pior = medidor.tempos[:medidor.n, 0].max() * 1000.0 if medidor.n else 0.0
+        fases = "  ".join(f"{nome} {m[1 + i]:.1f}" for i, nome in enumerate(FASES))
+        self.linhas = (f"{medidor.fps():.0f} FPS   frame {m[0]:.1f} ms (pior {pior:.0f})",
+                       fases,
+                       f"draws {self.draws}   objetos GL {objetos_gl}")
+        y = Y0 + ALT_GRAFICO + 10 + 12
+        self._bloco = tuple((X0 + 4, y + (2 - i) * ALT_LINHA, texto) for i, texto in enumerate(self.linhas))
+
+    def desenha(self, medidor, objetos_gl):
+        """Submete painel + gráfico ao lote e escreve o texto (chama no fim do render)."""
+        self._conta_draws()
+        agora = time.perf_counter()
+        if agora >= self.proximo_texto:
+            self._atualiza_texto(medidor, objetos_gl)
+            self.proximo_texto = agora + 1.0 / TEXTO_HZ
+
+        r, lote = self.renderer, self.renderer.lote
+        alt_total = ALT_GRAFICO + 10 + 3 * ALT_LINHA + 20
+        lote.quad(X0 + LARGURA / 2, Y0 + alt_total / 2, LARGURA + 10, alt_total, COR_FUNDO)
+
+        # gráfico: uma barra por frame, altura = tempo do frame
+        ms = medidor.intervalos() * 1000.0
+        n = len(ms)
+        if n:
+            alturas = np.minimum(ms, MS_TOPO) * (ALT_GRAFICO / MS_TOPO) + 1.0
+            cores = CORES_BARRA[(ms > 1000.0 / 60 + 1.0).astype(np.intp) + (ms > 2000.0 / 60 + 1.0)]
+            lote.adiciona_varios(QUAD, self._xs[AMOSTRAS - n:], Y0 + 5 + alturas / 2,
+                                 self._larg_barra, alturas, cores)
+        alvo = Y0 + 5 + (1000.0 / 60) * (ALT_GRAFICO / MS_TOPO)
+        lote.quad(X0 + LARGURA / 2, alvo, LARGURA, 1, COR_ALVO)
+
+        # divisão média do frame entre as fases, numa barra empilhada
+        m = medidor.medias()[1:]
+        soma = m.sum()
+        x = X0
+        y = Y0 + ALT_GRAFICO + 10
+        for i, cor in enumerate(CORES_FASES):
+            w = LARGURA * m[i] / soma if soma > 0 else 0.0
+            if w > 0:
+                lote.quad(x + w / 2, y, w, 6, cor)
+            x += w
+
+        # as três linhas numa malha só (refeita só quando o texto muda, TEXTO_HZ)
+        r.flush()   # painel e gráfico ficam atrás do texto
+        r.texto.desenha_bloco(self._bloco, COR_TEXTO)
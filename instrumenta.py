@@ -0,0 +1,187 @@
+"""
+Contador de chamadas GL por frame, atribuídas ao método que as originou.
+
+Os módulos fazem "from OpenGL.GL import *", então cada função gl* é um
+global do módulo. liga() troca esses globais (no módulo da Application e
+nos de MODULOS_GL) por versões que contam e devolve os originais no
+desliga(): desligado, o custo é zero, porque não sobra wrapper nenhum.
+
+Cada chamada é atribuída ao método de Renderer/Application mais interno na
+pilha (desenha_mensagem, escreve_texto, flush…). Com o lote, desenha_pc e
+desenha_mensagem só submetem formas; o GL delas aparece em flush.
+
+    instr = Instrumentacao(app)
+    instr.liga()
+    ... frames ...
+    instr.traca()           # despeja as chamadas do próximo frame
+    print(instr.relatorio())
+    instr.desliga()
+"""
+import sys
+from collections import Counter
+from numbers import Integral
+
+MODULOS_GL = ("lote", "texto", "estado_gl", "fundo", "pacotes")
+
+# além das glDraw*: a cópia da camada de fundo também pinta a tela inteira
+DESENHOS_EXTRA = ("glBlitFramebuffer",)
+
+
+def e_desenho(nome):
+    return nome.startswith("glDraw") or nome in DESENHOS_EXTRA
+
+
+# bytes enviados à GPU por chamada, a partir dos argumentos
+def _bytes_dados(dados, padrao=0):
+    return getattr(dados, "nbytes", padrao)
+
+
+BYTES = {
+    # glBufferData(alvo, tamanho, dados, uso)
+    "glBufferData":    lambda a: int(a[1]) if isinstance(a[1], Integral) else _bytes_dados(a[1]),
+    # glBufferSubData(alvo, offset, tamanho, dados)
+    "glBufferSubData": lambda a: int(a[2]) if isinstance(a[2], Integral) else _bytes_dados(a[3]),
+    # glTexImage2D(alvo, nível, fmt_int, w, h, borda, fmt, tipo, dados)
+    "glTexImage2D":    lambda a: _bytes_dados(a[8], a[3] * a[4] * 4) if a[8] is not None else 0,
+    # glTexSubImage2D(alvo, nível, x, y, w, h, fmt, tipo, dados)
+    "glTexSubImage2D": lambda a: _bytes_dados(a[8], a[4] * a[5] * 4),
+}
+
+FORA_DO_FRAME = "(fora do render)"
+
+
+def _resumo(args, limite=60):
+    texto = ", ".join(type(a).__name__ + str(getattr(a, "shape", "")) if hasattr(a, "nbytes")
+                      else repr(a) for a in args)
+    return texto if len(texto) <= limite else texto[:limite - 1] + "…"
+
+
+# ============================================================ #
+#                      Instrumentação GL                       #
+# ============================================================ #
+class Instrumentacao:
+    def __init__(self, app, modulos=MODULOS_GL):
+        self.app = app
+        mod = sys.modules[type(app).__module__]
+        self.modulos = [mod] + [sys.modules[m] for m in modulos if m in sys.modules]
+        # código → nome de cada método de Renderer/Application (atribuição)
+        self.metodos = {}
+        for nome_classe in ("Renderer", "Application"):
+            cls = getattr(mod, nome_classe, None)
+            for nome, f in vars(cls or object).items():
+                if hasattr(f, "__code__"):
+                    self.metodos[f.__code__] = f"{nome_classe}.{nome}"
+        self.originais = {}         # (módulo, nome) → função verdadeira
+        self.zera()
+        self.tracando = False
+        self.trace = []
+
+    @property
+    def ativo(self):
+        return bool(self.originais)
+
+    def zera(self):
+        self.frames   = 0
+        self.total    = Counter()   # (método, função) → chamadas, todos os frames
+        self.bytes    = Counter()   # método → bytes enviados
+        self.frame    = Counter()   # frame corrente
+        self.ultimo   = Counter()   # último frame completo
+        self.vivos    = 0           # objetos glGen* − glDelete* desde zera() (delta, não o total)
+        self.dentro   = False
+
+    # ---------------- liga / desliga ---------------- #
+    def liga(self):
+        if self.ativo:
+            return
+        for mod in self.modulos:
+            for nome, f in list(vars(mod).items()):
+                if nome.startswith("gl") and callable(f):
+                    self.originais[(mod, nome)] = f
+                    setattr(mod, nome, self._embrulha(nome, f))
+        # fronteira de frame: um render() na instância (some no desliga)
+        render = type(self.app).render.__get__(self.app)
+        def render_medido(*args, **kwargs):
+            self.dentro = True
+            try:
+                return render(*args, **kwargs)
+            finally:
+                self.dentro = False
+                self._fim_frame()
+        self.app.render = render_medido
+
+    def desliga(self):
+        for (mod, nome), f in self.originais.items():
+            setattr(mod, nome, f)
+        self.originais.clear()
+        self.app.__dict__.pop("render", None)
+
+    def traca(self):
+        """Guarda todas as chamadas do próximo frame e imprime no fim dele."""
+        self.tracando = True
+        self.trace = []
+
+    # ------------------- contagem ------------------- #
+    def _origem(self):
+        f = sys._getframe(2)
+        while f is not None:
+            nome = self.metodos.get(f.f_code)
+            if nome:
+                return nome
+            f = f.f_back
+        return FORA_DO_FRAME
+
+    def _embrulha(self, nome, original):
+        medidor = BYTES.get(nome)
+        gera    = nome.startswith("glGen")
+        apaga   = nome.startswith("glDelete")
+        def f(*args):
+            origem = self._origem() if self.dentro else FORA_DO_FRAME
+            self.frame[(origem, nome)] += 1
+            if medidor:
+                self.bytes[origem] += medidor(args)
+            if gera or apaga:
+                n = int(args[0]) if args and isinstance(args[0], Integral) else 1
+                self.vivos += n if gera else -n
+            if self.tracando and self.dentro:
+                self.trace.append((origem, nome, _resumo(args)))
+            return original(*args)
+        f.__name__ = nome
+        return f
+
+    def _fim_frame(self):
+        self.frames += 1
+        self.total.update(self.frame)
+        self.ultimo, self.frame = self.frame, Counter()
+        if self.tracando:
+            self.tracando = False
+            print(f"---- trace do frame {self.frames}: {len(self.trace)} chamadas GL ----")
+            for origem, nome, args in self.trace:
+                print(f"  {origem:28s} {nome}({args})")
+
+    # ------------------- relatório ------------------ #
+    def por_metodo(self):
+        """{método: {"chamadas", "draws", "bytes"} por frame}, média desde o zera()."""
+        n = max(self.frames, 1)
+        tabela = {}
+        for (origem, nome), c in self.total.items():
+            t = tabela.setdefault(origem, {"chamadas": 0.0, "draws": 0.0, "bytes": 0.0})
+            t["chamadas"] += c / n
+            if e_desenho(nome):
+                t["draws"] += c / n
+        for origem, b in self.bytes.items():
+            tabela.setdefault(origem, {"chamadas": 0.0, "draws": 0.0, "bytes": 0.0})["bytes"] = b / n
+        return tabela
+
+    def relatorio(self):
+        linhas = [f"GL em {self.frames} frames (média por frame):",
+                  f"  {'método':28s} {'chamadas':>9s} {'draws':>6s} {'bytes':>9s}"]
+        tabela = sorted(self.por_metodo().items(), key=lambda kv: -kv[1]["chamadas"])
+        for origem, t in tabela:
+            linhas.append(f"  {origem:28s} {t['chamadas']:9.2f} {t['draws']:6.2f} {t['bytes']:9.0f}")
+        mais = Counter()
+        for (_, nome), c in self.total.items():
+            mais[nome] += c
+        linhas.append("  mais chamadas: " + ", ".join(
+            f"{nome} {c / max(self.frames, 1):.2f}" for nome, c in mais.most_common(5)))
+        linhas.append(f"  objetos GL criados − apagados no período: {self.vivos:+d}")
+        return "\n".join(linhas)
@@ -0,0 +1,196 @@
+"""
+Linha do tempo declarativa da animação, lida de um JSON e compilada em
+arrays planos no início.
+
+Cada etapa do arquivo diz o estado (nome de ESTADOS), quanto dura, a
+legenda, as camadas da mensagem (nomes de cores), o trecho de movimento
+(de → até), o giro (graus/s), a escala (início, fim) e qual tela fica acesa.
+Um trecho com "velocidade" (px/s) dura comprimento/velocidade, e não
+"duracao": o caminho todo vira uma tabela de comprimento de arco acumulado
+e o pacote anda com velocidade constante, seja o trecho curto ou longo.
+"pausa" (s) segura o pacote parado em "de" antes de andar.
+
+"de"/"ate" podem ser nomes de `lugares` em vez de [x, y]: quem carrega
+passa o dicionário (o trab6 monta o seu a partir da topologia). Um lugar
+que é uma lista de pontos é um caminho: a etapa vira um trecho por
+segmento, com a mesma velocidade, giro contínuo e escala interpolada pelo
+comprimento andado.
+
+    {"padrao": {"duracao": 8.3333, "escala": [1.0, 1.0]},
+     "etapas": [{"estado": "APLICACAO", "legenda": "...", "camadas": ["VERDE"],
+                 "de": [150, 200], "tela": "esq"},
+                {"estado": "MOVE", "ate": [650, 200], "giro": 300, ...}]}
+
+Campos ausentes vêm de "padrao"; "de" ausente continua do "ate" da etapa
+anterior e "ate" ausente é parado em "de". Compilado, o que desenhar no
+passo p sai de um índice (por_passo[p]) e de contas fixas, qualquer que
+seja o número de etapas; por isso dá para ir direto a qualquer passo.
+"""
+import json
+import math
+import os
+
+import numpy as np
+
+from relogio import PASSO_SIM
+
+TELAS = {None: (False, False), "esq": (True, False), "dir": (False, True)}
+
+
+def caminho_padrao(nome_modulo):
+    """linha_tempo_<módulo>.json ao lado deste arquivo."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), f"linha_tempo_{nome_modulo}.json")
+
+
+# ============================================================ #
+#                        Linha do tempo                        #
+# ============================================================ #
+class LinhaTempo:
+    """
+    Arrays por etapa (inicio, n_passos, pausa, estado, x0/y0/x1/y1, s0 e
+    comprimento no caminho, giro e ângulo inicial, escala, telas, mascara)
+    + por_passo, a etapa de cada passo da animação. Uma etapa com caminho
+    vira várias aqui (continua[k] marca as que seguem a anterior).
+    camadas[k] é a tupla das próprias constantes de cor (identidade
+    preservada) e mascara[k] tem o bit i ligado se a i-ésima cor da paleta
+    está na mensagem.
+    """
+    def __init__(self, dados, estados, paleta, passo=PASSO_SIM, lugares=None):
+        padrao = dados.get("padrao", {})
+        etapas = self._trechos([dict(padrao, **e) for e in dados["etapas"]], lugares or {})
+        nomes_cor = list(paleta)
+        self.passo = passo
+
+        n = len(etapas)
+        self.inicio   = np.zeros(n, dtype=np.int64)
+        self.n_passos = np.zeros(n, dtype=np.int64)
+        self.pausa    = np.zeros(n, dtype=np.int64)      # passos parado antes de andar
+        self.estado   = np.zeros(n, dtype=np.int64)
+        self.x0 = np.zeros(n); self.y0 = np.zeros(n)
+        self.x1 = np.zeros(n); self.y1 = np.zeros(n)
+        self.s0 = np.zeros(n); self.comprimento = np.zeros(n)   # arco acumulado (px)
+        self.giro = np.zeros(n)                          # graus por passo
+        self.ang0 = np.zeros(n)                          # ângulo no começo (caminho: vem do trecho anterior)
+        self.continua = np.zeros(n, dtype=bool)
+        self.esc0 = np.ones(n); self.esc1 = np.ones(n)
+        self.tela_esq = np.zeros(n, dtype=bool)
+        self.tela_dir = np.zeros(n, dtype=bool)
+        self.mascara  = np.zeros(n, dtype=np.int64)
+        legendas, camadas = [], []
+
+        t, s, ang = 0, 0.0, 0.0
+        for k, e in enumerate(etapas):
+            de, ate = e["de"], e["ate"]
+            comprimento = math.hypot(ate[0] - de[0], ate[1] - de[1])
+            if comprimento > 0 and "velocidade" in e:
+                segundos = comprimento / float(e["velocidade"])
+            else:
+                segundos = float(e["duracao"])
+            pausa  = int(round(float(e.get("pausa", 0.0)) / passo))
+            passos = pausa + int(round(segundos / passo))
+            if passos < 1:
+                raise ValueError(f"etapa {k} ({e['estado']}) dura menos de um passo")
+            self.inicio[k], self.n_passos[k], self.pausa[k] = t, passos, pausa
+            self.s0[k], self.comprimento[k] = s, comprimento
+            s += comprimento
+            self.estado[k] = estados[e["estado"]]
+            self.x0[k], self.y0[k] = de
+            self.x1[k], self.y1[k] = ate
+            self.giro[k] = float(e.get("giro", 0.0)) * passo
+            self.continua[k] = e.get("continua", False)
+            self.ang0[k] = ang if self.continua[k] else 0.0
+            ang = self.ang0[k] + self.giro[k] * (passos - pausa)
+            self.esc0[k], self.esc1[k] = e.get("escala", (1.0, 1.0))
+            self.tela_esq[k], self.tela_dir[k] = TELAS[e.get("tela")]
+            cores = tuple(e.get("camadas", ()))
+            camadas.append(tuple(paleta[c] for c in cores))
+            self.mascara[k] = sum(1 << nomes_cor.index(c) for c in set(cores))
+            legendas.append(e.get("legenda", ""))
+            t += passos
+
+        self.total    = t
+        self.legendas = tuple(legendas)
+        self.camadas  = tuple(camadas)
+        self.por_passo = np.repeat(np.arange(n), self.n_passos)
+        # cópias em listas: no caminho de um frame só, indexar lista é mais barato que array
+        self._l = [a.tolist() for a in (self.inicio, self.n_passos, self.pausa, self.x0, self.y0,
+                                         self.x1, self.y1, self.giro, self.ang0, self.esc0, self.esc1)]
+        self._por_passo = self.por_passo.tolist()
+        self._estado    = self.estado.tolist()
+
+    @staticmethod
+    def _trechos(etapas, lugares):
+        # resolve "de"/"ate" (nomes → pontos) e quebra cada caminho em segmentos retos
+        def pontos(valor):
+            p = lugares[valor] if isinstance(valor, str) else valor
+            return [tuple(q) for q in p] if np.ndim(p) == 2 else [tuple(p)]
+
+        trechos, pos = [], (0.0, 0.0)
+        for e in etapas:
+            de = pontos(e.get("de", pos))[-1]
+            caminho = [de] + pontos(e.get("ate", de))
+            caminho = [p for i, p in enumerate(caminho) if i == 0 or p != caminho[i - 1]] or [de]
+            pos = caminho[-1]
+            if len(caminho) <= 2:
+                trechos.append(dict(e, de=de, ate=pos))
+                continue
+            comp = [math.hypot(b[0] - a[0], b[1] - a[1]) for a, b in zip(caminho, caminho[1:])]
+            total = sum(comp)
+            e0, e1 = e.get("escala", (1.0, 1.0))
+            andado = 0.0
+            for j, (a, b) in enumerate(zip(caminho, caminho[1:])):
+                t = dict(e, de=a, ate=b, continua=j > 0,
+                         escala=(e0 + (e1 - e0) * andado / total,
+                                 e0 + (e1 - e0) * (andado + comp[j]) / total))
+                if j:
+                    t["pausa"] = 0.0
+                if "velocidade" not in e:
+                    t["duracao"] = float(e["duracao"]) * comp[j] / total
+                andado += comp[j]
+                trechos.append(t)
+        return trechos
+
+    @classmethod
+    def carrega(cls, caminho, estados, paleta, passo=PASSO_SIM, lugares=None):
+        with open(caminho, encoding="utf-8") as f:
+            return cls(json.load(f), estados, paleta, passo, lugares)
+
+    @property
+    def duracao(self):
+        return self.total * self.passo
+
+    # ------------------- consulta ------------------- #
+    def etapa(self, p):
+        """Índice da etapa no passo p (int; fora da faixa, a primeira/última)."""
+        return self._por_passo[min(max(p, 0), self.total - 1)]
+
+    def estado_em(self, p):
+        return self._estado[self.etapa(p)]
+
+    def distancias(self, t):
+        """Quanto do caminho (px, comprimento de arco) já foi andado em cada instante t."""
+        k, x, y, _, _ = self.poses(t)
+        return self.s0[k] + np.hypot(x - self.x0[k], y - self.y0[k])
+
+    def pose(self, t, k=None):
+        """(x, y, ângulo, escala) no instante t, em passos (fracionário), dentro da etapa k."""
+        if k is None:
+            k = self.etapa(int(t))
+        inicio, n, pausa, x0, y0, x1, y1, giro, ang0, e0, e1 = (l[k] for l in self._l)
+        d = max(t - inicio - pausa, 0.0)          # passos andando
+        f = d / (n - pausa) if n > pausa else 0.0
+        return (x0 + (x1 - x0) * f, y0 + (y1 - y0) * f,
+                (ang0 + giro * d) % 360.0, e0 + (e1 - e0) * f)
+
+    def poses(self, t):
+        """pose() vetorizada: t é um array de instantes; devolve (k, x, y, ângulo, escala)."""
+        t = np.asarray(t, dtype=np.float64)
+        k = self.por_passo[np.clip(t.astype(np.int64), 0, self.total - 1)]
+        d = np.maximum(t - self.inicio[k] - self.pausa[k], 0.0)
+        andando = self.n_passos[k] - self.pausa[k]
+        f = np.where(andando > 0, d / np.maximum(andando, 1), 0.0)
+        return (k,
+                self.x0[k] + (self.x1[k] - self.x0[k]) * f,
+                self.y0[k] + (self.y1[k] - self.y0[k]) * f,
+                (self.ang0[k] + self.giro[k] * d) % 360.0,
+                self.esc0[k] + (self.esc1[k] - self.esc0[k]) * f)
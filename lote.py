@@ -0,0 +1,239 @@
+import numpy as np
+from OpenGL.GL import *
+import ctypes
+import math
+from estado_gl import EstadoGL, Programa
+
+# tipos de forma
+QUAD, HEXAGONO = 0, 1
+
+# colunas da tabela de instâncias; uma linha sobe para a GPU como está
+X, Y, SX, SY, ROT, TIPO, R, G, B, A = range(10)
+BYTES_INSTANCIA = 10 * 4
+
+# toda forma percorre os 18 vértices do hexágono; o quad usa 6 e completa
+# com triângulos degenerados (área zero, nenhum fragmento)
+VERTS_FORMA = 18
+
+# ----------------- Shaders GLSL ----------------- #
+lote_vertex_shader = """
+#version 330 core
+layout (location = 0) in vec2 quad;        // malha local de cada tipo
+layout (location = 1) in vec2 hexagono;
+layout (location = 2) in vec4 xform;       // por instância: x, y, largura (raio), altura
+layout (location = 3) in vec2 rot_tipo;    // por instância: rotação (graus), tipo
+layout (location = 4) in vec4 color;       // por instância
+uniform mat4 projection;
+out vec4 vColor;
+void main() {
+    // mesmo sentido da antiga matriz model (horário para ângulo positivo)
+    float a = radians(rot_tipo.x);
+    float c = cos(a), s = sin(a);
+    // quad não é uniforme: largura/altura esticam a malha; hexágono usa o raio
+    vec2 p = rot_tipo.y == 0.0 ? quad * xform.zw : hexagono * xform.z;
+    p = vec2(c * p.x + s * p.y, -s * p.x + c * p.y) + xform.xy;
+    gl_Position = projection * vec4(p, 0.0, 1.0);
+    vColor = color;
+}
+"""
+
+lote_fragment_shader = """
+#version 330 core
+in vec4 vColor;
+out vec4 fragColor;
+void main() {
+    fragColor = vColor;
+}
+"""
+
+
+def _malha_quad():
+    # quadrado unitário centrado, dois triângulos
+    v = [(-0.5, -0.5), (0.5, -0.5), (0.5, 0.5),
+         (-0.5, -0.5), (0.5, 0.5), (-0.5, 0.5)]
+    return np.array(v, dtype=np.float32)
+
+
+def _malha_hexagono():
+    # raio 1, seis fatias de pizza (mesma ordem do hexágono do PacotesGL)
+    borda = [(math.cos(math.radians(60 * i)), math.sin(math.radians(60 * i))) for i in range(6)]
+    v = []
+    for i in range(6):
+        v += [(0.0, 0.0), borda[i], borda[(i + 1) % 6]]
+    return np.array(v, dtype=np.float32)
+
+
+def _malhas():
+    # (VERTS_FORMA, 4): quad.xy, hexagono.xy lado a lado, num VBO estático
+    m = np.zeros((VERTS_FORMA, 4), dtype=np.float32)
+    m[:6, 0:2] = _malha_quad()
+    m[:, 2:4]  = _malha_hexagono()
+    return m
+
+
+# ============================================================ #
+#                      Lote de formas 2D                       #
+# ============================================================ #
+class LoteFormas:
+    """
+    Junta os quads e hexágonos do frame numa tabela de instâncias e, no
+    flush, sobe a tabela como está para um VBO de instâncias: uma
+    glDrawArraysInstanced para o frame inteiro, 40 bytes por forma. As
+    malhas locais ficam num VBO estático, e o tipo de cada instância escolhe
+    qual usar. É uma chamada só, e não uma por tipo, porque a ordem de
+    submissão (e com ela o blending) precisa ser a de desenhar forma por
+    forma.
+
+    Rotação e escala ficam no vertex shader, sem trigonometria no Python.
+    """
+    def __init__(self, capacidade=64, estado=None):
+        self.inst    = np.zeros((capacidade, 10), dtype=np.float32)
+        self.n       = 0
+        self.estado   = estado or EstadoGL()
+        self.programa = None
+        self.shader   = None
+        self.vao      = None
+        self.vbo      = None       # instâncias
+        self.vbo_malha = None
+        self.cap_vbo  = 0          # em instâncias
+        self.draw_calls = 0       # acumulado; quem mede zera
+
+    USO_VBO = GL_DYNAMIC_DRAW     # reescrito a cada frame
+
+    def init_gl(self, projection, programa=None):
+        """Com `programa` (de outro lote já iniciado) o shader é compartilhado."""
+        if programa is None:
+            programa = Programa(lote_vertex_shader, lote_fragment_shader, ("projection",))
+            glUseProgram(programa.id)
+            glUniformMatrix4fv(programa.loc["projection"], 1, GL_FALSE, projection)
+        self.programa = programa
+        self.shader = programa.id
+
+        self.vao = self.estado.gera(glGenVertexArrays)
+        self.vbo_malha = self.estado.gera(glGenBuffers)
+        self.vbo = self.estado.gera(glGenBuffers)
+        glBindVertexArray(self.vao)
+        malhas = _malhas()
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo_malha)
+        glBufferData(GL_ARRAY_BUFFER, malhas.nbytes, malhas, GL_STATIC_DRAW)
+        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 4 * 4, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE, 4 * 4, ctypes.c_void_p(2 * 4))
+        glEnableVertexAttribArray(1)
+        # atributos por instância: as colunas da tabela
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        self._reserva_vbo(len(self.inst))
+        for local, coluna, tamanho in ((2, X, 4), (3, ROT, 2), (4, R, 4)):
+            glVertexAttribPointer(local, tamanho, GL_FLOAT, GL_FALSE, BYTES_INSTANCIA,
+                                  ctypes.c_void_p(coluna * 4))
+            glEnableVertexAttribArray(local)
+            glVertexAttribDivisor(local, 1)
+        glBindVertexArray(0)
+
+    def _reserva_vbo(self, n):
+        # só cresce; chamado com o VBO de instâncias já ligado
+        if n <= self.cap_vbo:
+            return
+        self.cap_vbo = max(n, 2 * self.cap_vbo)
+        glBufferData(GL_ARRAY_BUFFER, self.cap_vbo * BYTES_INSTANCIA, None, self.USO_VBO)
+
+    def _cresce(self, n):
+        while n > len(self.inst):
+            self.inst = np.concatenate((self.inst, np.zeros_like(self.inst)))
+
+    # -------------------- submissão -------------------- #
+    def adiciona(self, tipo, x, y, sx, sy, cor, rot=0.0):
+        """Devolve o índice da forma (None se nada foi adicionado)."""
+        if cor[3] == 0.0:
+            return None         # totalmente transparente: não muda nenhum pixel
+        self._cresce(self.n + 1)
+        linha = self.inst[self.n]
+        linha[X], linha[Y], linha[SX], linha[SY] = x, y, sx, sy
+        linha[ROT], linha[TIPO] = rot, tipo
+        linha[R:] = cor
+        self.n += 1
+        return self.n - 1
+
+    def adiciona_varios(self, tipo, x, y, sx, sy, cores, rot=0.0):
+        """
+        Várias formas do mesmo tipo de uma vez (arrays; escalares valem para
+        todas). Devolve o índice da primeira; as outras vêm em seguida.
+        """
+        cores = np.asarray(cores, dtype=np.float32)
+        n = max(np.size(x), np.size(y), np.size(sx), np.size(sy), len(cores) if cores.ndim == 2 else 1)
+        self._cresce(self.n + n)
+        bloco = self.inst[self.n:self.n + n]
+        bloco[:, X], bloco[:, Y], bloco[:, SX], bloco[:, SY] = x, y, sx, sy
+        bloco[:, ROT], bloco[:, TIPO] = rot, tipo
+        bloco[:, R:] = cores
+        self.n += n
+        return self.n - n
+
+    def quad(self, x, y, w, h, cor):
+        return self.adiciona(QUAD, x, y, w, h, cor)
+
+    def hexagono(self, x, y, r, cor, rot=0.0):
+        return self.adiciona(HEXAGONO, x, y, r, r, cor, rot)
+
+    # ---------------------- flush ---------------------- #
+    def flush(self):
+        """Desenha tudo que foi submetido desde o último flush (numa chamada)."""
+        n = self.n
+        if n == 0:
+            return
+        self.estado.usa_programa(self.shader)
+        self.estado.liga_vao(self.vao)
+        self.estado.liga_buffer(GL_ARRAY_BUFFER, self.vbo)
+        self._reserva_vbo(n)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, n * BYTES_INSTANCIA, self.inst)
+        glDrawArraysInstanced(GL_TRIANGLES, 0, VERTS_FORMA, n)
+        self.draw_calls += 1
+        self.n = 0
+
+
+# ============================================================ #
+#                 Cena estática (modo retido)                  #
+# ============================================================ #
+class CenaEstatica(LoteFormas):
+    """
+    Formas que não se mexem, registradas uma vez com a mesma API do lote
+    (quad, hexagono, adiciona_varios) e assadas num VBO estático: por frame
+    é uma glDrawArraysInstanced, não importa quantas formas a cena tenha. Só
+    a cor muda depois de assada (pinta), e só a cor daquela forma sobe para
+    a GPU. Para trocar a geometria: limpa() e registrar de novo.
+    """
+    USO_VBO = GL_STATIC_DRAW
+
+    def __init__(self, estado=None):
+        super().__init__(estado=estado)
+        self.assada = None        # formas no VBO (None = ainda não assada)
+
+    def limpa(self):
+        self.n = 0
+        self.assada = None
+
+    def assa(self):
+        self.estado.liga_buffer(GL_ARRAY_BUFFER, self.vbo)
+        self.cap_vbo = self.n
+        glBufferData(GL_ARRAY_BUFFER, max(self.n * BYTES_INSTANCIA, 4),
+                     self.inst if self.n else None, GL_STATIC_DRAW)
+        self.assada = self.n
+
+    def pinta(self, forma, cor):
+        """Troca a cor da forma de índice `forma` (só os 16 bytes dela sobem)."""
+        cores = self.inst[forma, R:]
+        cores[:] = cor
+        if self.assada is None:
+            return                # ainda não assada: sai com a cor nova
+        self.estado.liga_buffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferSubData(GL_ARRAY_BUFFER, forma * BYTES_INSTANCIA + R * 4, cores.nbytes, cores)
+
+    def desenha(self):
+        if self.assada is None:
+            self.assa()
+        if not self.assada:
+            return
+        self.estado.usa_programa(self.shader)
+        self.estado.liga_vao(self.vao)
+        glDrawArraysInstanced(GL_TRIANGLES, 0, VERTS_FORMA, self.assada)
+        self.draw_calls += 1
@@ -0,0 +1,203 @@
+"""
+Métricas de tempo de frame para coleta centralizada: JSON e arquivo .prom
+para o textfile collector do node-exporter.
+
+Por estado da animação: histograma do intervalo entre frames (p50/p95/p99
+saem dele, máx é exato), frames atrasados (intervalo > LIMIAR_ATRASO
+períodos), vsyncs perdidos e tempo na tela. Tudo fica em arrays alocados no
+início; registra() só incrementa, então medir não mexe no loop. A cada
+`intervalo` segundos os arquivos são reescritos de forma atômica (temporário
+no mesmo diretório + os.replace), e quem lê nunca vê um arquivo pela metade.
+Se a gravação falhar (disco cheio, diretório sem permissão), o temporário é
+apagado, sai um aviso na primeira vez e o render continua.
+
+    m = MetricasFrames(ESTADOS, arq_json="m.json", arq_prom="/var/lib/node_exporter/trab.prom")
+    ... a cada frame desenhado: m.registra(estado, time.perf_counter(), animando)
+    ... a cada volta do loop:   m.periodico(time.perf_counter())
+    m.escreve()
+"""
+import bisect
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from relogio import PASSO_SIM
+
+INTERVALO_ESCRITA = 10.0    # s entre regravações dos arquivos
+LIMIAR_ATRASO     = 1.5     # intervalo > 1,5 período = frame atrasado
+PREFIXO           = "encapsulamento"
+
+# limites superiores dos baldes do histograma (s); o último balde é +Inf
+BALDES = (0.002, 0.004, 0.008, 0.012, 0.0155, 0.0175, 0.020, 0.025,
+          0.0334, 0.050, 0.0667, 0.100, 0.250, 0.500, 1.0)
+
+
+def grava_atomico(caminho, texto):
+    """Grava texto em caminho sem janela em que o arquivo esteja incompleto."""
+    tmp = f"{caminho}.{os.getpid()}.tmp"      # .tmp: o node-exporter só lê *.prom
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(texto)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, caminho)
+    except OSError:
+        try:                                   # disco cheio, sem permissão…: não deixa lixo
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _quantil(contagem, q, maximo):
+    # interpolação linear dentro do balde onde cai o quantil q (0–1)
+    total = contagem.sum()
+    if total == 0:
+        return 0.0
+    alvo = q * total
+    acumulado = np.cumsum(contagem)
+    i = int(np.searchsorted(acumulado, alvo))
+    baixo = BALDES[i - 1] if i > 0 else 0.0
+    alto  = BALDES[i] if i < len(BALDES) else maximo
+    antes = acumulado[i - 1] if i > 0 else 0
+    frac  = (alvo - antes) / contagem[i] if contagem[i] else 1.0
+    return min(baixo + (alto - baixo) * frac, maximo)
+
+
+# ============================================================ #
+#                      Métricas por estado                     #
+# ============================================================ #
+class MetricasFrames:
+    def __init__(self, estados, arq_json=None, arq_prom=None, intervalo=INTERVALO_ESCRITA,
+                 periodo=PASSO_SIM, relogio=None, tempo=time.perf_counter):
+        self.nomes     = {cod: nome for nome, cod in estados.items()}
+        self.arq_json  = arq_json
+        self.arq_prom  = arq_prom
+        self.intervalo = intervalo
+        self.periodo   = periodo
+        self.relogio   = relogio          # RelogioFixo: segundos de simulação descartados
+        self.tempo     = tempo
+        n = max(estados.values()) + 1
+        self.contagem  = np.zeros((n, len(BALDES) + 1), dtype=np.int64)
+        self.soma      = np.zeros(n, dtype=np.float64)   # s, intervalos medidos
+        self.maximo    = np.zeros(n, dtype=np.float64)
+        self.atrasados = np.zeros(n, dtype=np.int64)
+        self.perdidos  = np.zeros(n, dtype=np.int64)     # vsyncs sem frame novo
+        self.segundos  = np.zeros(n, dtype=np.float64)   # tempo com o estado na tela
+        self.inicio    = time.time()
+        self._anterior = None                            # (instante, estado, animando)
+        self.proxima   = tempo() + intervalo
+        self.falhou    = False                           # já avisou de erro ao gravar
+
+    # ------------------- coleta ------------------- #
+    def registra(self, estado, agora, animando):
+        """Um frame desenhado em `agora` mostrando `estado`."""
+        if self._anterior is not None:
+            t_ant, e_ant, anim_ant = self._anterior
+            dt = agora - t_ant
+            self.segundos[e_ant] += dt       # o estado anterior ficou na tela até agora
+            # parado, o intervalo é o tempo de espera por evento, não de frame
+            if animando and anim_ant:
+                self.contagem[estado, bisect.bisect_left(BALDES, dt)] += 1
+                self.soma[estado] += dt
+                if dt > self.maximo[estado]:
+                    self.maximo[estado] = dt
+                if dt > LIMIAR_ATRASO * self.periodo:
+                    self.atrasados[estado] += 1
+                    self.perdidos[estado] += int(dt / self.periodo + 0.5) - 1
+        self._anterior = (agora, estado, animando)
+
+    def periodico(self, agora):
+        """Regrava os arquivos se já passou o intervalo (chamar a cada volta do loop)."""
+        if agora >= self.proxima:
+            self.proxima = agora + self.intervalo
+            self.escreve()
+
+    # ------------------- resumo ------------------- #
+    def resumo(self):
+        segundos = self.segundos.copy()
+        if self._anterior is not None:        # estado atual, desde o último frame
+            segundos[self._anterior[1]] += self.tempo() - self._anterior[0]
+        estados = {}
+        for cod, nome in sorted(self.nomes.items()):
+            c = self.contagem[cod]
+            n = int(c.sum())
+            if not n and not segundos[cod]:
+                continue
+            mx = float(self.maximo[cod])
+            estados[nome] = {
+                "frames":    n,
+                "media_ms":  round(1000.0 * self.soma[cod] / n, 3) if n else 0.0,
+                "p50_ms":    round(1000.0 * _quantil(c, 0.50, mx), 3),
+                "p95_ms":    round(1000.0 * _quantil(c, 0.95, mx), 3),
+                "p99_ms":    round(1000.0 * _quantil(c, 0.99, mx), 3),
+                "max_ms":    round(1000.0 * mx, 3),
+                "atrasados": int(self.atrasados[cod]),
+                "perdidos":  int(self.perdidos[cod]),
+                "segundos":  round(float(segundos[cod]), 3),
+            }
+        return {
+            "maquina":    platform.node(),
+            "pid":        os.getpid(),
+            "inicio":     time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.inicio)),
+            "atualizado": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "periodo_ms": round(1000.0 * self.periodo, 3),
+            "descartado_s": round(self.relogio.descartado, 3) if self.relogio else 0.0,
+            "estados":    estados,
+        }
+
+    def texto_prometheus(self, resumo=None):
+        """Formato de exposição do Prometheus (histograma + contadores por estado)."""
+        r = resumo or self.resumo()
+        p = PREFIXO
+        linhas = [f"# HELP {p}_frame_segundos Intervalo entre frames durante a animação.",
+                  f"# TYPE {p}_frame_segundos histogram"]
+        for cod, nome in sorted(self.nomes.items()):
+            if nome not in r["estados"]:
+                continue
+            acumulado = np.cumsum(self.contagem[cod])
+            for limite, c in zip(BALDES, acumulado):
+                linhas.append(f'{p}_frame_segundos_bucket{{estado="{nome}",le="{limite}"}} {c}')
+            linhas.append(f'{p}_frame_segundos_bucket{{estado="{nome}",le="+Inf"}} {acumulado[-1]}')
+            linhas.append(f'{p}_frame_segundos_sum{{estado="{nome}"}} {self.soma[cod]:.6f}')
+            linhas.append(f'{p}_frame_segundos_count{{estado="{nome}"}} {acumulado[-1]}')
+
+        metricas = (("frame_quantil_segundos", "gauge", "Quantis do intervalo entre frames (do histograma; 1 = máximo exato)."),
+                    ("frames_atrasados_total", "counter", f"Frames com intervalo acima de {LIMIAR_ATRASO} períodos."),
+                    ("frames_perdidos_total", "counter", "Vsyncs que passaram sem frame novo."),
+                    ("estado_segundos_total", "counter", "Tempo com cada estado na tela."))
+        for sufixo, tipo, ajuda in metricas:
+            linhas += [f"# HELP {p}_{sufixo} {ajuda}", f"# TYPE {p}_{sufixo} {tipo}"]
+            for nome, e in r["estados"].items():
+                if sufixo == "frame_quantil_segundos":
+                    for q, chave in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms"), ("1", "max_ms")):
+                        linhas.append(f'{p}_{sufixo}{{estado="{nome}",quantil="{q}"}} {e[chave] / 1000.0:.6f}')
+                else:
+                    chave = {"frames_atrasados_total": "atrasados", "frames_perdidos_total": "perdidos",
+                             "estado_segundos_total": "segundos"}[sufixo]
+                    linhas.append(f'{p}_{sufixo}{{estado="{nome}"}} {e[chave]}')
+        linhas += [f"# HELP {p}_simulacao_descartada_segundos_total Atraso jogado fora pelo teto de passos.",
+                   f"# TYPE {p}_simulacao_descartada_segundos_total counter",
+                   f"{p}_simulacao_descartada_segundos_total {r['descartado_s']}"]
+        return "\n".join(linhas) + "\n"
+
+    def escreve(self):
+        """Regrava os arquivos; erro de E/S só gera um aviso (o primeiro) e a animação segue."""
+        if not (self.arq_json or self.arq_prom):
+            return
+        r = self.resumo()
+        for caminho, gera in ((self.arq_json, lambda: json.dumps(r, indent=2, ensure_ascii=False) + "\n"),
+                              (self.arq_prom, lambda: self.texto_prometheus(r))):
+            if not caminho:
+                continue
+            try:
+                grava_atomico(caminho, gera())
+            except OSError as e:
+                if not self.falhou:
+                    self.falhou = True
+                    print(f"métricas: não foi possível gravar ({e}); tenta de novo a cada {self.intervalo:g} s",
+                          file=sys.stderr)
@@ -0,0 +1,239 @@
+"""
+Renderização sem janela (servidor sem display/GPU).
+
+Dois jeitos de conseguir um contexto OpenGL 3.3 core:
+  egl  -> EGL "surfaceless" do Mesa (llvmpipe em software), sem X nem janela
+  glfw -> janela GLFW invisível (precisa de display, mas não aparece nada)
+
+Em ambos a cena vai para um framebuffer object do tamanho da janela, o loop
+update()/render() roda sem esperar vsync nem relógio e cada quadro volta
+como array NumPy (altura, largura, 4) RGBA, com a linha 0 no topo.
+
+    python offscreen.py trab6 --backend egl
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+
+BACKENDS = ("egl", "glfw")
+EGL_PLATFORM_SURFACELESS_MESA = 0x31DD
+
+
+def prepara(backend):
+    # o PyOpenGL escolhe a plataforma no primeiro import: tem que vir antes dos trab*.py
+    if backend == "egl":
+        carregado = "OpenGL.GL" in sys.modules
+        if carregado and os.environ.get("PYOPENGL_PLATFORM") != "egl":
+            raise RuntimeError("backend egl: defina PYOPENGL_PLATFORM=egl antes de importar o OpenGL")
+        os.environ["PYOPENGL_PLATFORM"] = "egl"
+
+
+# ============================================================ #
+#                     Contexto sem janela                      #
+# ============================================================ #
+class ContextoOffscreen:
+    """Cria e torna corrente um contexto GL 3.3 core sem janela visível."""
+    def __init__(self, backend="egl"):
+        if backend not in BACKENDS:
+            raise ValueError(f"backend desconhecido: {backend}")
+        prepara(backend)
+        self.backend = backend
+        self.janela  = None
+        self.display = None
+        self.contexto = None
+        if backend == "egl":
+            self._cria_egl()
+        else:
+            self._cria_glfw()
+
+    def _cria_egl(self):
+        import ctypes
+        from OpenGL import EGL
+
+        self.display = EGL.EGL_NO_DISPLAY
+        try:
+            # sem X/Wayland: pede direto a plataforma surfaceless do Mesa
+            from OpenGL.EGL.EXT.platform_base import eglGetPlatformDisplayEXT
+            self.display = eglGetPlatformDisplayEXT(EGL_PLATFORM_SURFACELESS_MESA, None, None)
+        except Exception:
+            pass
+        if not self.display:
+            self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        maior, menor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(self.display, ctypes.pointer(maior), ctypes.pointer(menor)):
+            raise RuntimeError("eglInitialize falhou")
+
+        atrib = (EGL.EGLint * 5)(EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+                                 EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT, EGL.EGL_NONE)
+        config, n = EGL.EGLConfig(), EGL.EGLint()
+        if not EGL.eglChooseConfig(self.display, atrib, ctypes.pointer(config), 1, ctypes.pointer(n)) or n.value < 1:
+            raise RuntimeError("nenhuma configuração EGL com OpenGL")
+
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        versao = (EGL.EGLint * 7)(EGL.EGL_CONTEXT_MAJOR_VERSION, 3,
+                                  EGL.EGL_CONTEXT_MINOR_VERSION, 3,
+                                  EGL.EGL_CONTEXT_OPENGL_PROFILE_MASK,
+                                  EGL.EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT,
+                                  EGL.EGL_NONE)
+        self.contexto = EGL.eglCreateContext(self.display, config, EGL.EGL_NO_CONTEXT, versao)
+        if not self.contexto:
+            raise RuntimeError("eglCreateContext falhou")
+        # sem superfície nenhuma: tudo é desenhado no FBO
+        EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, self.contexto)
+
+    def _cria_glfw(self):
+        import glfw
+        if not glfw.init():
+            raise RuntimeError("Falha ao iniciar GLFW")
+        glfw.window_hint(glfw.VISIBLE, glfw.FALSE)
+        glfw.window_hint(glfw.CONTEXT_VERSION_MAJOR, 3)
+        glfw.window_hint(glfw.CONTEXT_VERSION_MINOR, 3)
+        glfw.window_hint(glfw.OPENGL_PROFILE, glfw.OPENGL_CORE_PROFILE)
+        self.janela = glfw.create_window(64, 64, "offscreen", None, None)
+        if not self.janela:
+            glfw.terminate()
+            raise RuntimeError("Falha ao criar janela invisível")
+        glfw.make_context_current(self.janela)
+
+    def fecha(self):
+        if self.backend == "egl":
+            from OpenGL import EGL
+            EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+            EGL.eglDestroyContext(self.display, self.contexto)
+            EGL.eglTerminate(self.display)
+        else:
+            import glfw
+            glfw.destroy_window(self.janela)
+            glfw.terminate()
+
+
+# ============================================================ #
+#                  Framebuffer de renderização                 #
+# ============================================================ #
+class Framebuffer:
+    """FBO com um renderbuffer RGBA8; fica ligado como destino de desenho."""
+    def __init__(self, largura, altura):
+        import numpy as np
+        from OpenGL.GL import (glGenFramebuffers, glBindFramebuffer, glGenRenderbuffers,
+                               glBindRenderbuffer, glRenderbufferStorage,
+                               glFramebufferRenderbuffer, glCheckFramebufferStatus,
+                               GL_FRAMEBUFFER, GL_RENDERBUFFER, GL_RGBA8,
+                               GL_COLOR_ATTACHMENT0, GL_FRAMEBUFFER_COMPLETE)
+        self.largura, self.altura = largura, altura
+        self.fbo = glGenFramebuffers(1)
+        self.cor = glGenRenderbuffers(1)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.cor)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, largura, altura)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, self.cor)
+        if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError("framebuffer incompleto")
+        # buffer de leitura reaproveitado; o GL entrega de baixo para cima
+        self._pixels = np.empty((altura, largura, 4), dtype=np.uint8)
+
+    def le(self):
+        """Lê o quadro atual. Devolve uma view (linha 0 no topo) do buffer reaproveitado."""
+        from OpenGL.GL import glReadPixels, GL_RGBA, GL_UNSIGNED_BYTE
+        glReadPixels(0, 0, self.largura, self.altura, GL_RGBA, GL_UNSIGNED_BYTE, self._pixels)
+        return self._pixels[::-1]
+
+    def apaga(self):
+        from OpenGL.GL import glDeleteFramebuffers, glDeleteRenderbuffers
+        glDeleteFramebuffers(1, [self.fbo])
+        glDeleteRenderbuffers(1, [self.cor])
+
+
+# ============================================================ #
+#                     Aplicação sem janela                     #
+# ============================================================ #
+class Headless:
+    """
+    Monta contexto + FBO e a Application de um trab*.py (trab4, trab5, trab6).
+    quadros() roda a animação inteira o mais rápido possível, um update()
+    por quadro (passo fixo de 1/60 s), e devolve cada quadro como array.
+    """
+    def __init__(self, nome_modulo="trab6", backend="egl"):
+        self.contexto = ContextoOffscreen(backend)
+        self.modulo   = importlib.import_module(nome_modulo)
+        self.fbo      = Framebuffer(self.modulo.WINDOW_WIDTH, self.modulo.WINDOW_HEIGHT)
+        self.app      = self.modulo.Application()
+        self.app.init_gl()
+
+    def renderiza(self, limite=None, inicio=0):
+        """
+        Roda IDLE→animação→IDLE (inclusive o primeiro e o último quadro) e
+        gera o índice de cada quadro logo depois de desenhá-lo no FBO.
+        Quem consome decide como ler (fbo.le(), PBOs…).
+        Com inicio > 0 a simulação vai até lá sem desenhar (direto, se a
+        Application tiver vai_para(); senão repetindo update()) e limite
+        passa a ser o índice final, exclusivo.
+        """
+        self.app.inicia()
+        n = 0
+        if hasattr(self.app, "vai_para"):            # linha do tempo: acesso direto
+            n = self.app.vai_para(inicio)
+        else:
+            while n < inicio and self.app.animando():
+                self.app.update()
+                n += 1
+        if n < inicio:
+            return
+        while limite is None or n < limite:
+            self.app.render()
+            yield n
+            n += 1
+            if not self.app.animando():
+                break
+            self.app.update()
+
+    def total_quadros(self):
+        """Quantos quadros a animação tem (só simulação, sem desenhar)."""
+        self.app.inicia()
+        if hasattr(self.app, "vai_para"):
+            return self.app.vai_para(sys.maxsize) + 1    # o último passo + o quadro IDLE final
+        n = 1
+        while self.app.animando():
+            self.app.update()
+            n += 1
+        return n
+
+    def quadros(self, limite=None, copia=True):
+        """
+        Gera cada quadro como array. Com copia=False o array é sempre o mesmo
+        buffer (sobrescrito a cada quadro).
+        """
+        for _ in self.renderiza(limite):
+            quadro = self.fbo.le()
+            yield quadro.copy() if copia else quadro
+
+    def fecha(self):
+        self.fbo.apaga()
+        self.contexto.fecha()
+
+
+# ----------------------- Função main ----------------------- #
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Renderiza a animação sem janela")
+    parser.add_argument("modulo", nargs="?", default="trab6", help="trab4, trab5 ou trab6")
+    parser.add_argument("--backend", choices=BACKENDS, default="egl")
+    parser.add_argument("--quadros", type=int, default=None, help="para depois de N quadros")
+    args = parser.parse_args(argv)
+
+    prepara(args.backend)
+    h = Headless(args.modulo, args.backend)
+    try:
+        t0 = time.perf_counter()
+        n = 0
+        for _ in h.quadros(args.quadros, copia=False):
+            n += 1
+        dt = time.perf_counter() - t0
+    finally:
+        h.fecha()
+    print(f"{args.modulo}: {n} quadros em {dt:.2f} s ({n / dt:.0f} quadros/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
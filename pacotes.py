@@ -0,0 +1,276 @@
+import numpy as np
+from OpenGL.GL import *
+import ctypes
+import math
+from estado_gl import EstadoGL, Programa
+from topologia import SEM_ROTA, HOST, SWITCH, ROTEADOR
+
+# anéis da mensagem (Aplicação … Física) e o tamanho de cada um
+N_ANEIS    = 5
+RAIO_BASE  = 30.0       # mesmo desenho do desenha_mensagem do trab6
+PASSO_ANEL = 8.0
+TODOS_ANEIS = (1 << N_ANEIS) - 1
+
+# camadas que sobram no nó: o switch tira e recoloca a Física para ler o
+# quadro (Enlace); o roteador tira Física e Enlace para ler o datagrama (Rede)
+MASCARA_NO = np.zeros(3, dtype=np.uint32)
+MASCARA_NO[HOST]     = TODOS_ANEIS
+MASCARA_NO[SWITCH]   = TODOS_ANEIS & ~(1 << 4)
+MASCARA_NO[ROTEADOR] = TODOS_ANEIS & ~(1 << 4) & ~(1 << 3)
+TRECHO_NO = 0.2         # fração do enlace, junto a cada ponta, em que o pacote aparece como no nó
+
+ESCALA_TRAFEGO = 0.3    # pacote de tráfego em relação à escala da topologia
+GIRO_TRAFEGO   = 1.5    # graus girados por px andado (sentido: para onde o enlace vai)
+
+# ----------------- Shaders GLSL ----------------- #
+# uma instância por (pacote, anel): os atributos do pacote avançam a cada
+# N_ANEIS instâncias (divisor) e o anel sai de gl_InstanceID
+pacotes_vertex_shader = f"""
+#version 330 core
+layout (location = 0) in vec2 position;   // hexágono de raio 1
+layout (location = 1) in vec4 xform;      // x, y, escala, rotação (graus) do pacote
+layout (location = 2) in uint mascara;    // bit i = anel i presente
+uniform mat4 projection;
+uniform vec4 cores[{N_ANEIS}];
+out vec4 vColor;
+void main() {{
+    int anel = {N_ANEIS - 1} - gl_InstanceID % {N_ANEIS};   // maior primeiro: fica atrás
+    if ((mascara & (1u << uint(anel))) == 0u) {{
+        gl_Position = vec4(2.0, 2.0, 2.0, 1.0);            // fora do recorte: descartado
+        vColor = vec4(0.0);
+        return;
+    }}
+    float a = radians(xform.w);
+    float c = cos(a), s = sin(a);
+    vec2 p = xform.z * ({RAIO_BASE} + {PASSO_ANEL} * float(anel)) * position;
+    p = vec2(c * p.x + s * p.y, -s * p.x + c * p.y) + xform.xy;
+    gl_Position = projection * vec4(p, 0.0, 1.0);
+    vColor = cores[anel];
+}}
+"""
+
+pacotes_fragment_shader = """
+#version 330 core
+in vec4 vColor;
+out vec4 fragColor;
+void main() {
+    fragColor = vColor;
+}
+"""
+
+
+# ============================================================ #
+#                 Pacotes em colunas (SoA)                     #
+# ============================================================ #
+class Pacotes:
+    """
+    Muitos pacotes indo de host em host pela topologia, cada um no seu enlace.
+    O estado é uma coluna NumPy por campo (de onde saiu, para onde vai no
+    salto atual, destino final, fração andada do enlace, velocidade, ângulo)
+    e update() avança todos numa conta só. Quem chega a um nó pega o próximo
+    salto direto da tabela da topologia (proximo[nó, destino]); quem chega ao
+    destino sorteia outro host. A cada salto também mudam, por pacote, o
+    sentido do giro e as camadas com que ele sai de um nó e chega ao
+    seguinte (MASCARA_NO). Posição, escala, ângulo e camadas vão direto para
+    as colunas de saída (xform, mascara), que sobem para a GPU sem conversão.
+    """
+    def __init__(self, topologia, capacidade=1024, velocidade=3.0, semente=0):
+        self.topo    = topologia
+        self.escala  = ESCALA_TRAFEGO * topologia.escala
+        self.velocidade = velocidade            # px por passo (média)
+        self.rng     = np.random.default_rng(semente)
+        self.n       = 0
+        self.de      = np.zeros(capacidade, dtype=np.int32)
+        self.para    = np.zeros(capacidade, dtype=np.int32)
+        self.destino = np.zeros(capacidade, dtype=np.int32)
+        self.f       = np.zeros(capacidade)                       # 0–1 no enlace atual
+        self.vel     = np.ones(capacidade, dtype=np.float32)      # px por passo
+        self.inv     = np.zeros(capacidade, dtype=np.float32)     # 1 / comprimento do enlace
+        self.ang     = np.zeros(capacidade, dtype=np.float32)     # graus
+        self.giro    = np.zeros(capacidade, dtype=np.float32)     # graus por passo no enlace atual
+        self.sai     = np.zeros(capacidade, dtype=np.uint32)      # camadas ao sair de `de`
+        self.chega   = np.zeros(capacidade, dtype=np.uint32)      # camadas ao chegar a `para`
+        self.xform   = np.zeros((capacidade, 4), dtype=np.float32)
+        self.mascara = np.zeros(capacidade, dtype=np.uint32)
+
+    def _cresce(self, capacidade):
+        def maior(a):
+            b = np.zeros((capacidade,) + a.shape[1:], dtype=a.dtype)
+            b[:len(a)] = a
+            return b
+        self.de, self.para, self.destino = maior(self.de), maior(self.para), maior(self.destino)
+        self.f, self.vel, self.inv = maior(self.f), maior(self.vel), maior(self.inv)
+        self.ang, self.giro = maior(self.ang), maior(self.giro)
+        self.sai, self.chega = maior(self.sai), maior(self.chega)
+        self.xform, self.mascara  = maior(self.xform), maior(self.mascara)
+
+    def quantidade(self, n):
+        """Passa a ter n pacotes; os novos saem de hosts sorteados, já no meio do primeiro enlace."""
+        hosts = self.topo.hosts
+        if len(hosts) < 2:
+            n = 0                                # sem par de hosts, sem tráfego
+        if n > len(self.de):
+            self._cresce(max(n, 2 * len(self.de)))
+        if n > self.n:
+            novos = np.arange(self.n, n)
+            self.de[novos]  = hosts[self.rng.integers(len(hosts), size=len(novos))]
+            self.vel[novos] = self.velocidade * self.rng.uniform(0.8, 1.2, len(novos))
+            self.ang[novos] = self.rng.uniform(0.0, 360.0, len(novos))
+            self._sorteia_destino(novos)
+            self._proximo_salto(novos)
+            self.f[novos] = self.rng.random(len(novos))
+        self.n = n
+
+    def _sorteia_destino(self, sel):
+        # outro host qualquer: sorteia entre H-1 e pula a posição do próprio
+        hosts = self.topo.hosts
+        r = self.rng.integers(len(hosts) - 1, size=len(sel))
+        r += r >= np.searchsorted(hosts, self.de[sel])
+        self.destino[sel] = hosts[r]
+
+    def _proximo_salto(self, sel):
+        de = self.de[sel]
+        para = self.topo.proximo[de, self.destino[sel]]
+        # sem rota (enlace derrubado): fica parado e tenta outro destino no próximo update
+        sem_rota = para == SEM_ROTA
+        para[sem_rota] = de[sem_rota]
+        px, py = self.topo.portas()
+        comprimento = np.hypot(px[para] - px[de], py[para] - py[de])
+        self.para[sel] = para
+        self.inv[sel]  = np.where(sem_rota, 0.0, 1.0 / np.maximum(comprimento, 1.0))
+        self.f[sel]    = np.where(sem_rota, 1.0, 0.0)
+        # gira para o lado em que o enlace anda em x (vertical: horário); parado não gira
+        sentido = np.where(px[para] < px[de], -1.0, 1.0)
+        sentido[sem_rota] = 0.0
+        self.giro[sel]  = sentido * self.vel[sel] * GIRO_TRAFEGO
+        tipo = self.topo.tipo
+        self.sai[sel]   = MASCARA_NO[tipo[de]]
+        self.chega[sel] = MASCARA_NO[tipo[para]]
+
+    def update(self, passos=1.0):
+        n = self.n
+        if not n:
+            return
+        f = self.f[:n]
+        f += self.vel[:n] * self.inv[:n] * passos
+        ang = self.ang[:n]
+        ang += self.giro[:n] * passos
+        np.mod(ang, 360.0, out=ang)
+        chegou = np.nonzero(f >= 1.0)[0]
+        if not len(chegou):
+            return
+        parado = self.para[chegou] == self.de[chegou]      # estava sem rota
+        self.de[chegou] = self.para[chegou]
+        refaz = chegou[parado | (self.de[chegou] == self.destino[chegou])]
+        if len(refaz):
+            self._sorteia_destino(refaz)
+        self._proximo_salto(chegou)
+
+    def prepara(self, atraso=0.0):
+        """Preenche xform/mascara no instante atual menos `atraso` passos (interpolação)."""
+        n = self.n
+        if not n:
+            return
+        f = self.f[:n] - self.vel[:n] * self.inv[:n] * atraso
+        np.clip(f, 0.0, 1.0, out=f)
+        px, py = self.topo.portas()
+        de, para = self.de[:n], self.para[:n]
+        xf = self.xform[:n]
+        xf[:, 0] = px[de] + (px[para] - px[de]) * f
+        xf[:, 1] = py[de] + (py[para] - py[de]) * f
+        xf[:, 2] = self.escala
+        xf[:, 3] = self.ang[:n] - self.giro[:n] * atraso
+        # no meio do cabo o quadro leva todas as camadas; junto a um switch ou
+        # roteador aparece só com as que sobram lá dentro
+        mascara = self.mascara[:n]
+        mascara[:] = TODOS_ANEIS
+        np.copyto(mascara, self.sai[:n], where=f < TRECHO_NO)
+        np.copyto(mascara, self.chega[:n], where=f > 1.0 - TRECHO_NO)
+
+
+# ============================================================ #
+#                 Desenho instanciado dos pacotes              #
+# ============================================================ #
+class PacotesGL:
+    """
+    Todos os pacotes numa única glDrawElementsInstanced sobre um hexágono de
+    raio 1 (centro + 6 vértices, seis fatias de pizza): só as colunas xform
+    e mascara sobem por frame (dois glBufferSubData).
+    """
+    def __init__(self, cores_aneis, estado=None):
+        self.cores    = np.array(cores_aneis, dtype=np.float32).reshape(N_ANEIS, 4)
+        self.estado   = estado or EstadoGL()
+        self.programa = None
+        self.shader   = None
+        self.vao      = None
+        self.vbo_xform   = None
+        self.vbo_mascara = None
+        self.capacidade  = 0
+        self.n_indices   = 0
+        self.draw_calls  = 0       # acumulado; quem mede zera
+
+    def init_gl(self, projection):
+        self.programa = Programa(pacotes_vertex_shader, pacotes_fragment_shader,
+                                 ("projection", "cores"))
+        self.shader = self.programa.id
+        glUseProgram(self.shader)
+        glUniformMatrix4fv(self.programa.loc["projection"], 1, GL_FALSE, projection)
+        glUniform4fv(self.programa.loc["cores"], N_ANEIS, self.cores)
+
+        vertices = [0.0, 0.0]
+        indices  = []
+        for i in range(6):
+            ang = math.radians(60 * i)
+            vertices += [math.cos(ang), math.sin(ang)]
+            indices  += [0, i + 1, i + 2] if i < 5 else [0, i + 1, 1]
+        vertices = np.array(vertices, dtype=np.float32)
+        indices  = np.array(indices, dtype=np.uint32)
+        self.n_indices = len(indices)
+
+        self.vao = self.estado.gera(glGenVertexArrays)
+        vbo, ebo = self.estado.gera(glGenBuffers, 2)
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
+        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 2 * 4, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(0)
+
+        # atributos por instância, no mesmo VAO
+        self.vbo_xform, self.vbo_mascara = self.estado.gera(glGenBuffers, 2)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo_xform)
+        glVertexAttribPointer(1, 4, GL_FLOAT, GL_FALSE, 4 * 4, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(1)
+        glVertexAttribDivisor(1, N_ANEIS)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo_mascara)
+        glVertexAttribIPointer(2, 1, GL_UNSIGNED_INT, 4, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(2)
+        glVertexAttribDivisor(2, N_ANEIS)
+        glBindVertexArray(0)
+        self._reserva(256)
+
+    def _reserva(self, n):
+        # só cresce; os dois buffers ficam com a mesma capacidade (em pacotes)
+        if n <= self.capacidade:
+            return
+        self.capacidade = max(n, 2 * self.capacidade)
+        self.estado.liga_buffer(GL_ARRAY_BUFFER, self.vbo_xform)
+        glBufferData(GL_ARRAY_BUFFER, self.capacidade * 16, None, GL_STREAM_DRAW)
+        self.estado.liga_buffer(GL_ARRAY_BUFFER, self.vbo_mascara)
+        glBufferData(GL_ARRAY_BUFFER, self.capacidade * 4, None, GL_STREAM_DRAW)
+
+    def desenha(self, pacotes):
+        n = pacotes.n
+        if not n:
+            return
+        self._reserva(n)
+        self.estado.liga_buffer(GL_ARRAY_BUFFER, self.vbo_xform)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, n * 16, pacotes.xform)
+        self.estado.liga_buffer(GL_ARRAY_BUFFER, self.vbo_mascara)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, n * 4, pacotes.mascara)
+        self.estado.usa_programa(self.shader)
+        self.estado.liga_vao(self.vao)
+        glDrawElementsInstanced(GL_TRIANGLES, self.n_indices, GL_UNSIGNED_INT,
+                                ctypes.c_void_p(0), n * N_ANEIS)
+        self.draw_calls += 1
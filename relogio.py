@@ -0,0 +1,45 @@
+import time
+
+PASSO_SIM  = 1.0 / 60.0   # passo fixo da simulação (s)
+MAX_PASSOS = 5            # teto de passos por frame; atraso além disso é descartado
+TIMEOUT_OCIOSO = 0.5      # espera máxima por eventos quando nada está animando (s)
+
+
+# ============================================================ #
+#                     Relógio de passo fixo                    #
+# ============================================================ #
+class RelogioFixo:
+    """
+    Acumulador de passo fixo: a cada frame diz quantos passos de simulação
+    rodar (passos()) e quanto o frame está adiantado em relação ao último
+    passo (alfa, 0–1), para o render interpolar.
+    A velocidade da animação passa a depender do tempo real, não do FPS.
+    """
+    def __init__(self, tempo=time.perf_counter, passo=PASSO_SIM, max_passos=MAX_PASSOS):
+        self.tempo      = tempo
+        self.passo      = passo
+        self.max_passos = max_passos
+        self.anterior   = tempo()
+        self.acumulado  = 0.0
+        self.alfa       = 0.0
+        self.descartado = 0.0     # segundos jogados fora pelo teto (máquina lenta/travada)
+
+    def reinicia(self):
+        # depois de uma pausa longa (janela parada, idle): não tenta "alcançar"
+        self.anterior  = self.tempo()
+        self.acumulado = 0.0
+        self.alfa      = 0.0
+
+    def passos(self):
+        agora = self.tempo()
+        self.acumulado += agora - self.anterior
+        self.anterior = agora
+        n = int(self.acumulado / self.passo)
+        if n > self.max_passos:
+            excesso = (n - self.max_passos) * self.passo
+            self.descartado += excesso
+            self.acumulado  -= excesso
+            n = self.max_passos
+        self.acumulado -= n * self.passo
+        self.alfa = self.acumulado / self.passo
+        return n
@@ -0,0 +1,337 @@
+import numpy as np
+from OpenGL.GL import *
+import ctypes
+import hashlib
+import json
+import os
+import struct
+from estado_gl import EstadoGL, Programa
+
+# ------------------------ Fonte padrão ------------------------ #
+FONTE_PADRAO   = "arial.ttf"
+FONTES_RESERVA = ("DejaVuSans.ttf", "LiberationSans-Regular.ttf")
+TAMANHO_PADRAO = 24
+
+# ASCII imprimível + acentuação do português (textos do trab6)
+CHARSET_PADRAO = (
+    "".join(chr(c) for c in range(32, 127))
+    + "áàâãéêíóôõúüçÁÀÂÃÉÊÍÓÔÕÚÜÇ…"
+)
+
+LARGURA_ATLAS = 512
+MARGEM        = 1      # pixels vazios entre glifos (evita sangrar no filtro linear)
+MAX_CACHE     = 256    # strings com malha pronta guardadas
+
+# cache em disco do atlas (muda a VERSAO_CACHE se o formato mudar)
+VERSAO_CACHE = 2
+MAGICO_CACHE = b"GLFATLAS"
+PASTA_CACHE  = os.environ.get(
+    "TRAB_CACHE_FONTES",
+    os.path.join(os.path.expanduser("~"), ".cache", "trabCMCO05"))
+
+# colunas da tabela de métricas de cada glifo
+AVANCO, BEARING_X, BEARING_Y, LARG, ALT, U0, V0, U1, V1 = range(9)
+
+# ----------------- Shaders GLSL ----------------- #
+text_vertex_shader = """
+#version 330 core
+layout (location = 0) in vec4 vertex; // <vec2 pos, vec2 tex>
+uniform mat4 projection;
+out vec2 TexCoord;
+void main() {
+    gl_Position = projection * vec4(vertex.xy, 0.0, 1.0);
+    TexCoord = vertex.zw;
+}
+"""
+
+text_fragment_shader = """
+#version 330 core
+in vec2 TexCoord;
+out vec4 fragColor;
+uniform sampler2D text;
+uniform vec4 color;
+void main() {
+    fragColor = vec4(color.rgb, color.a * texture(text, TexCoord).r);
+}
+"""
+
+
+def abre_fonte(fonte, tamanho):
+    """A fonte pedida ou, se não existir, a primeira de FONTES_RESERVA que existir."""
+    from PIL import ImageFont
+    for nome in (fonte,) + FONTES_RESERVA:
+        try:
+            return ImageFont.truetype(nome, tamanho)
+        except OSError:
+            continue
+    raise OSError(f"fonte não encontrada: {fonte}")
+
+
+# ============================================================ #
+#                        Atlas de glifos                       #
+# ============================================================ #
+class AtlasGlifos:
+    """
+    Textura de um canal com todos os glifos do charset + tabela de métricas.
+    A rasterização (PIL/FreeType) acontece uma única vez, na construção.
+    `arquivo` é o arquivo de fonte que o FreeType abriu de fato.
+    """
+    def __init__(self, pixels, metricas, charset, ascendente, descendente, arquivo=None):
+        self.pixels      = pixels        # uint8 (altura, largura), linha 0 = topo
+        self.metricas    = metricas      # float32 (n_glifos, 9)
+        self.charset     = charset
+        self.ascendente  = ascendente
+        self.descendente = descendente
+        self.indice      = {c: i for i, c in enumerate(charset)}
+        self.reserva     = self.indice.get("?", 0)
+        self.arquivo     = arquivo
+
+    @classmethod
+    def rasteriza(cls, fonte=FONTE_PADRAO, tamanho=TAMANHO_PADRAO, charset=CHARSET_PADRAO):
+        from PIL import Image, ImageDraw
+        font = abre_fonte(fonte, tamanho)
+        ascendente, descendente = font.getmetrics()
+
+        # empacotamento em prateleiras (linhas de altura fixa)
+        alt_linha = ascendente + descendente + MARGEM
+        caixas, posicoes = [], []
+        px, py = MARGEM, MARGEM
+        for c in charset:
+            l, t, r, b = font.getbbox(c)
+            w, h = max(r - l, 0), max(b - t, 0)
+            if px + w + MARGEM > LARGURA_ATLAS:
+                px, py = MARGEM, py + alt_linha
+            caixas.append((l, t, w, h))
+            posicoes.append((px, py))
+            px += w + MARGEM
+        altura = py + alt_linha
+
+        img  = Image.new("L", (LARGURA_ATLAS, altura), 0)
+        draw = ImageDraw.Draw(img)
+        metricas = np.zeros((len(charset), 9), dtype=np.float32)
+        for i, c in enumerate(charset):
+            l, t, w, h = caixas[i]
+            gx, gy = posicoes[i]
+            if w and h:
+                draw.text((gx - l, gy - t), c, font=font, fill=255)
+            metricas[i] = (font.getlength(c), l, ascendente - t, w, h,
+                           gx / LARGURA_ATLAS, gy / altura,
+                           (gx + w) / LARGURA_ATLAS, (gy + h) / altura)
+        pixels = np.asarray(img, dtype=np.uint8)
+        return cls(pixels, metricas, charset, ascendente, descendente,
+                   os.path.abspath(font.path))
+
+    # ------------------- cache em disco ------------------- #
+    # Layout: MAGICO | versão u32 | tam. cabeçalho u32 | cabeçalho JSON
+    #         | métricas float32 (n, 9) | pixels uint8 (alt, larg)
+    # Métricas e pixels começam alinhados em 16 bytes para o memmap.
+    # O cabeçalho guarda o arquivo de fonte que o FreeType abriu (nome solto
+    # é procurado nas pastas do sistema, ou cai numa reserva) com tamanho e
+    # mtime: abrir o cache só faz os.stat nele, sem carregar PIL/FreeType.
+    @staticmethod
+    def chave_cache(fonte, tamanho, charset):
+        partes = [str(VERSAO_CACHE), fonte, str(tamanho), charset]
+        return hashlib.sha1("\0".join(partes).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def carrega(cls, fonte=FONTE_PADRAO, tamanho=TAMANHO_PADRAO, charset=CHARSET_PADRAO,
+                pasta=PASTA_CACHE):
+        """
+        Abre o atlas do cache (memmap, sem PIL/FreeType); se não existir, for
+        de outra versão ou o arquivo da fonte tiver mudado, rasteriza e grava
+        o cache para a próxima execução.
+        """
+        caminho = os.path.join(pasta, f"atlas-{cls.chave_cache(fonte, tamanho, charset)}.bin")
+        try:
+            return cls.abre_cache(caminho, fonte, tamanho, charset)
+        except (OSError, ValueError):
+            pass
+        atlas = cls.rasteriza(fonte, tamanho, charset)
+        try:
+            atlas.salva_cache(caminho, fonte, tamanho)
+        except OSError:
+            pass        # sem permissão de escrita: segue sem cache
+        return atlas
+
+    @classmethod
+    def abre_cache(cls, caminho, fonte, tamanho, charset):
+        with open(caminho, "rb") as f:
+            magico = f.read(len(MAGICO_CACHE))
+            versao, tam = struct.unpack("<II", f.read(8))
+            if magico != MAGICO_CACHE or versao != VERSAO_CACHE:
+                raise ValueError("cache de atlas inválido")
+            cab = json.loads(f.read(tam).decode("utf-8"))
+        if (cab["fonte"], cab["tamanho"], cab["charset"]) != (fonte, tamanho, charset):
+            raise ValueError("cache de atlas de outra fonte")
+        arquivo = cab["arquivo"]
+        if os.path.isfile(fonte) and os.path.abspath(fonte) != arquivo:
+            raise ValueError("cache de atlas de outro arquivo de fonte")
+        st = os.stat(arquivo)            # fonte apagada: OSError, rasteriza de novo
+        if (st.st_size, st.st_mtime_ns) != (cab["tam_arquivo"], cab["mtime_arquivo"]):
+            raise ValueError("arquivo de fonte trocado desde o cache")
+        n, (alt, larg) = len(charset), cab["forma"]
+        metricas = np.memmap(caminho, dtype=np.float32, mode="r",
+                             offset=cab["off_metricas"], shape=(n, 9))
+        pixels   = np.memmap(caminho, dtype=np.uint8, mode="r",
+                             offset=cab["off_pixels"], shape=(alt, larg))
+        return cls(pixels, metricas, charset, cab["ascendente"], cab["descendente"], arquivo)
+
+    def salva_cache(self, caminho, fonte, tamanho):
+        def alinha(n):
+            return (n + 15) & ~15
+
+        st = os.stat(self.arquivo)
+        cab = {"fonte": fonte, "tamanho": tamanho, "charset": self.charset,
+               "arquivo": self.arquivo, "tam_arquivo": st.st_size, "mtime_arquivo": st.st_mtime_ns,
+               "ascendente": self.ascendente, "descendente": self.descendente,
+               "forma": list(self.pixels.shape)}
+        # offsets dependem do tamanho do próprio cabeçalho: reserva espaço fixo p/ eles
+        cab["off_metricas"] = cab["off_pixels"] = 10 ** 9
+        inicio = len(MAGICO_CACHE) + 8 + len(json.dumps(cab).encode("utf-8"))
+        cab["off_metricas"] = alinha(inicio)
+        cab["off_pixels"]   = alinha(cab["off_metricas"] + self.metricas.nbytes)
+        dados = json.dumps(cab).encode("utf-8").ljust(inicio - len(MAGICO_CACHE) - 8)
+
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        tmp = f"{caminho}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGICO_CACHE + struct.pack("<II", VERSAO_CACHE, len(dados)) + dados)
+            f.write(b"\0" * (cab["off_metricas"] - f.tell()))
+            f.write(np.ascontiguousarray(self.metricas, dtype=np.float32).tobytes())
+            f.write(b"\0" * (cab["off_pixels"] - f.tell()))
+            f.write(np.ascontiguousarray(self.pixels, dtype=np.uint8).tobytes())
+        os.replace(tmp, caminho)     # atômico: outra instância nunca lê arquivo pela metade
+
+    def malha(self, texto, x, y):
+        """
+        Vértices (pos.xy, uv) de uma string, 6 por caractere, já em coordenadas de tela.
+        (x, y) é o canto inferior esquerdo da linha, como no escreve_texto antigo.
+        """
+        n = len(texto)
+        ids = np.fromiter((self.indice.get(c, self.reserva) for c in texto),
+                          dtype=np.intp, count=n)
+        m = self.metricas[ids]
+        caneta = np.empty(n, dtype=np.float32)
+        caneta[0] = x
+        np.cumsum(m[:-1, AVANCO], out=caneta[1:])
+        caneta[1:] += x
+        base = y + self.descendente
+
+        x0 = caneta + m[:, BEARING_X]
+        x1 = x0 + m[:, LARG]
+        y1 = base + m[:, BEARING_Y]
+        y0 = y1 - m[:, ALT]
+        u0, v0, u1, v1 = m[:, U0], m[:, V0], m[:, U1], m[:, V1]
+
+        verts = np.empty((n, 6, 4), dtype=np.float32)
+        verts[:, 0] = np.stack((x0, y0, u0, v1), axis=1)
+        verts[:, 1] = np.stack((x1, y0, u1, v1), axis=1)
+        verts[:, 2] = np.stack((x1, y1, u1, v0), axis=1)
+        verts[:, 3] = verts[:, 0]
+        verts[:, 4] = verts[:, 2]
+        verts[:, 5] = np.stack((x0, y1, u0, v0), axis=1)
+        return verts.reshape(-1, 4)
+
+
+# ============================================================ #
+#                     Texto em lote (OpenGL)                   #
+# ============================================================ #
+class TextoGL:
+    """
+    Desenha strings com o atlas: um VBO dinâmico, uma chamada de desenho por
+    string, ou por bloco de strings da mesma cor (desenha_bloco).
+    Nada de textura/VAO criado fora do init_gl (nem quando a string muda).
+    """
+    def __init__(self, atlas, estado=None):
+        self.atlas      = atlas
+        self.estado     = estado or EstadoGL()
+        self.programa   = None
+        self.shader     = None
+        self.textura    = None
+        self.vao        = None
+        self.vbo        = None
+        self.capacidade = 0       # em caracteres
+        self.cor        = None    # última cor enviada ao uniform
+        self._malhas    = {}
+        self.draw_calls = 0       # acumulado; quem mede zera
+
+    def init_gl(self, projection):
+        self.programa = Programa(text_vertex_shader, text_fragment_shader,
+                                 ("projection", "text", "color"))
+        self.shader = self.programa.id
+        glUseProgram(self.shader)
+        glUniformMatrix4fv(self.programa.loc["projection"], 1, GL_FALSE, projection)
+        glUniform1i(self.programa.loc["text"], 0)
+
+        # textura de um canal (GL_R8)
+        alt, larg = self.atlas.pixels.shape
+        self.textura = self.estado.gera(glGenTextures)
+        glBindTexture(GL_TEXTURE_2D, self.textura)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_R8, larg, alt, 0, GL_RED, GL_UNSIGNED_BYTE, self.atlas.pixels)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+
+        self.vao = self.estado.gera(glGenVertexArrays)
+        self.vbo = self.estado.gera(glGenBuffers)
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        self._reserva(128)
+        glVertexAttribPointer(0, 4, GL_FLOAT, GL_FALSE, 4 * 4, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(0)
+        glBindVertexArray(0)
+
+    def _reserva(self, n_chars):
+        # só cresce; chamado com o VBO já ligado
+        if n_chars <= self.capacidade:
+            return
+        while self.capacidade < n_chars:
+            self.capacidade = max(2 * self.capacidade, 128)
+        glBufferData(GL_ARRAY_BUFFER, self.capacidade * 6 * 4 * 4, None, GL_DYNAMIC_DRAW)
+
+    def _malha(self, texto, x, y):
+        chave = (texto, x, y)
+        verts = self._malhas.get(chave)
+        if verts is None:
+            if len(self._malhas) >= MAX_CACHE:
+                self._malhas.clear()
+            verts = self._malhas[chave] = self.atlas.malha(texto, x, y)
+        return verts
+
+    def desenha(self, x, y, texto, cor=(0.0, 0.0, 0.0)):
+        if not texto:
+            return
+        self._desenha_malha(self._malha(texto, x, y), cor)
+
+    def desenha_bloco(self, linhas, cor=(0.0, 0.0, 0.0)):
+        """
+        Várias strings ((x, y, texto), ...) numa chamada de desenho só. A malha
+        junta fica no mesmo cache das strings, com a tupla `linhas` de chave:
+        só é refeita quando alguma das strings muda.
+        """
+        verts = self._malhas.get(linhas)
+        if verts is None:
+            partes = [self.atlas.malha(texto, x, y) for x, y, texto in linhas if texto]
+            if not partes:
+                return
+            if len(self._malhas) >= MAX_CACHE:
+                self._malhas.clear()
+            verts = self._malhas[linhas] = np.concatenate(partes)
+        self._desenha_malha(verts, cor)
+
+    def _desenha_malha(self, verts, cor):
+        estado = self.estado
+        estado.usa_programa(self.shader)
+        r, g, b = float(cor[0]), float(cor[1]), float(cor[2])
+        if (r, g, b) != self.cor:
+            glUniform4f(self.programa.loc["color"], r, g, b, 1.0)
+            self.cor = (r, g, b)
+        estado.liga_textura(0, self.textura)
+        estado.liga_vao(self.vao)
+        estado.liga_buffer(GL_ARRAY_BUFFER, self.vbo)
+        self._reserva(len(verts) // 6)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, verts.nbytes, verts)
+        glDrawArrays(GL_TRIANGLES, 0, len(verts))
+        self.draw_calls += 1
@@ -0,0 +1,201 @@
+"""
+Topologia da rede desenhada em cena: hosts, switches e roteadores ligados
+por enlaces, lida de um JSON.
+
+    {"escala": 1.0,
+     "nos": [{"nome": "PC1", "tipo": "host", "pos": [150, 300]},
+             {"nome": "R1",  "tipo": "roteador", "pos": [400, 450]}, ...],
+     "enlaces": [["PC1", "R1"], ...],
+     "aula": {"esq": "PC1", "dir": "PC2"}}
+
+"aula" diz quais hosts são as telas "esq"/"dir" da linha do tempo.
+
+As rotas saem de uma tabela de próximo salto para todos os pares
+(proximo[origem, destino]), calculada uma vez a cada mudança na topologia
+e guardada; rotear um pacote a cada frame é só indexar a tabela. Host não
+encaminha tráfego de ninguém, então só switches e roteadores entram como
+intermediários no Floyd–Warshall: o custo é O(R·N²) com R = nº de
+switches + roteadores, e não O(N³).
+"""
+import json
+import os
+
+import numpy as np
+
+HOST, SWITCH, ROTEADOR = 0, 1, 2
+TIPOS = {"host": HOST, "switch": SWITCH, "roteador": ROTEADOR}
+
+SEM_ROTA = -1
+DESCE_PORTA = 50       # o cabo do host sai da faixa da camada Física (y - 50·escala)
+
+
+def caminho_padrao(nome_modulo):
+    """topologia_<módulo>.json ao lado deste arquivo."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), f"topologia_{nome_modulo}.json")
+
+
+# ============================================================ #
+#                          Topologia                           #
+# ============================================================ #
+class Topologia:
+    """
+    Nós em arrays (tipo, x, y) e enlaces como pares de índices. Toda mudança
+    (adiciona, liga, desliga) incrementa `versao`; a tabela de rotas e a
+    geometria dos cabos são refeitas só quando alguém as pede numa versão nova.
+    """
+    def __init__(self, escala=1.0):
+        self.escala  = float(escala)
+        self.nomes   = []
+        self.indice  = {}                    # nome → índice
+        self.tipo    = np.zeros(0, dtype=np.int8)
+        self.x       = np.zeros(0)
+        self.y       = np.zeros(0)
+        self.enlaces = set()                 # (i, j) com i < j
+        self.aula    = (None, None)          # hosts das telas esq/dir
+        self.versao  = 0
+        self._rotas  = None                  # (versao, proximo, saltos)
+        self._cabos  = None                  # (versao, cx, cy, comprimento, angulo)
+        self._portas = None                  # (versao, px, py)
+
+    @classmethod
+    def carrega(cls, caminho):
+        with open(caminho, encoding="utf-8") as f:
+            dados = json.load(f)
+        topo = cls(dados.get("escala", 1.0))
+        for no in dados["nos"]:
+            topo.adiciona(no["nome"], no["tipo"], *no["pos"])
+        for a, b in dados.get("enlaces", ()):
+            topo.liga(a, b)
+        aula = dados.get("aula", {})
+        topo.aula = tuple(topo.indice[aula[lado]] if lado in aula else None for lado in ("esq", "dir"))
+        return topo
+
+    # ------------------- edição ------------------- #
+    def adiciona(self, nome, tipo, x, y):
+        if nome in self.indice:
+            raise ValueError(f"nó repetido: {nome}")
+        self.indice[nome] = len(self.nomes)
+        self.nomes.append(nome)
+        self.tipo = np.append(self.tipo, TIPOS[tipo] if isinstance(tipo, str) else tipo)
+        self.x = np.append(self.x, float(x))
+        self.y = np.append(self.y, float(y))
+        self.versao += 1
+        return self.indice[nome]
+
+    def _par(self, a, b):
+        i = self.indice[a] if isinstance(a, str) else int(a)
+        j = self.indice[b] if isinstance(b, str) else int(b)
+        if i == j:
+            raise ValueError(f"enlace de {self.nomes[i]} com ele mesmo")
+        return (i, j) if i < j else (j, i)
+
+    def liga(self, a, b):
+        self.enlaces.add(self._par(a, b))
+        self.versao += 1
+
+    def desliga(self, a, b):
+        self.enlaces.discard(self._par(a, b))
+        self.versao += 1
+
+    # ------------------- consulta ------------------- #
+    def __len__(self):
+        return len(self.nomes)
+
+    @property
+    def hosts(self):
+        return np.nonzero(self.tipo == HOST)[0]
+
+    def portas(self):
+        """(x, y) de onde sai o cabo de cada nó."""
+        if self._portas is None or self._portas[0] != self.versao:
+            desce = np.where(self.tipo == HOST, DESCE_PORTA * self.escala, 0.0)
+            self._portas = (self.versao, self.x, self.y - desce)
+        return self._portas[1:]
+
+    def rotas(self):
+        """(proximo, saltos), ambos N×N; SEM_ROTA (-1) onde o destino não é alcançável."""
+        if self._rotas is None or self._rotas[0] != self.versao:
+            self._rotas = (self.versao,) + self._calcula_rotas()
+        return self._rotas[1:]
+
+    @property
+    def proximo(self):
+        return self.rotas()[0]
+
+    def _calcula_rotas(self):
+        n = len(self)
+        infinito = 2 * n + 1
+        saltos  = np.full((n, n), infinito, dtype=np.int32)
+        proximo = np.full((n, n), SEM_ROTA, dtype=np.int32)
+        diagonal = np.arange(n)
+        saltos[diagonal, diagonal] = 0
+        proximo[diagonal, diagonal] = diagonal
+        if self.enlaces:
+            i, j = np.array(sorted(self.enlaces)).T
+            saltos[i, j] = saltos[j, i] = 1
+            proximo[i, j], proximo[j, i] = j, i
+        # Floyd–Warshall vetorizado, só com quem encaminha como intermediário
+        for k in np.nonzero(self.tipo != HOST)[0]:
+            via = saltos[:, k, None] + saltos[None, k, :]
+            melhor = via < saltos
+            np.copyto(saltos, via, where=melhor)
+            np.copyto(proximo, np.broadcast_to(proximo[:, k, None], (n, n)), where=melhor)
+        saltos[saltos >= infinito] = SEM_ROTA
+        return proximo, saltos
+
+    def caminho(self, a, b):
+        """Nós de a até b (inclusive), seguindo a tabela; [] se não há rota."""
+        i = self.indice[a] if isinstance(a, str) else int(a)
+        j = self.indice[b] if isinstance(b, str) else int(b)
+        proximo = self.proximo
+        if proximo[i, j] == SEM_ROTA:
+            return []
+        caminho = [i]
+        while i != j:
+            i = int(proximo[i, j])
+            caminho.append(i)
+        return caminho
+
+    def cabos(self):
+        """Centro, comprimento e ângulo (graus, sentido do lote) de cada enlace."""
+        if self._cabos is None or self._cabos[0] != self.versao:
+            px, py = self.portas()
+            if self.enlaces:
+                i, j = np.array(sorted(self.enlaces)).T
+            else:
+                i = j = np.zeros(0, dtype=np.intp)
+            dx, dy = px[j] - px[i], py[j] - py[i]
+            self._cabos = (self.versao, (px[i] + px[j]) / 2, (py[i] + py[j]) / 2,
+                           np.hypot(dx, dy), -np.degrees(np.arctan2(dy, dx)))
+        return self._cabos[1:]
+
+
+def laboratorio(salas=4, hosts_por_sala=24, largura=800, altura=600):
+    """
+    Topologia de sala de aula para testar escala: um roteador central, um
+    roteador + switch por sala (roteadores das salas vizinhas também ligados
+    entre si) e os hosts de cada sala pendurados no seu switch.
+    """
+    larg_sala = largura / salas
+    colunas = min(hosts_por_sala, 8)
+    dx = larg_sala / colunas
+    escala = min(dx / 140.0, 1.0)
+    dy = 160 * escala + 6
+    topo = Topologia(escala)
+    topo.adiciona("R0", ROTEADOR, largura / 2, altura - 50)
+    for s in range(salas):
+        cx = (s + 0.5) * larg_sala
+        topo.adiciona(f"R{s + 1}", ROTEADOR, cx, altura - 140)
+        topo.adiciona(f"S{s + 1}", SWITCH, cx, altura - 220)
+        topo.liga("R0", f"R{s + 1}")
+        topo.liga(f"R{s + 1}", f"S{s + 1}")
+        if s:
+            topo.liga(f"R{s}", f"R{s + 1}")
+        for h in range(hosts_por_sala):
+            linha, coluna = divmod(h, colunas)
+            x = s * larg_sala + (coluna + 0.5) * dx
+            y = altura - 300 - linha * dy
+            topo.liga(f"S{s + 1}", topo.adiciona(f"PC{s + 1}.{h + 1}", HOST, x, y))
+    primeiro, ultimo = topo.hosts[[0, -1]]
+    topo.aula = (int(primeiro), int(ultimo))
+    return topo
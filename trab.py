@@ -28,17 +28,58 @@ ESTADOS = {
 estadoAtual = ESTADOS["IDLE"]
 progressoAnimacao = 0.0
 velocidadeAnimacao = 0.005
+INTERVALO_MS = 16 #~60 passos por segundo, só enquanto a animação roda
 mensagem = "Oi!"
 
+LEGENDAS = [
+    "Camada de Aplicacao: Mensagem original",
+    "Camada de Transporte: Cabecalho TCP/UDP",
+    "Camada de Rede: Cabecalho IP",
+    "Camada de Enlace: Cabecalho Ethernet",
+    "Camada Fisica: Sinais eletricos",
+    "Pressione ESPACO para iniciar a animacao",
+    "Demonstracao de encapsulamento de pacotes na rede",
+    mensagem,
+]
+baseFonte = 0 #primeira display list dos 256 glifos
+listasTexto = {} #texto -> display list com a string inteira
+listaPC = listaTela = listaHexagono = 0
+listasCamadas = {} #tupla de cores -> display list com os hexagonos
+
 def init():
     glClearColor(*BRANCO, 1.0) #fundo da tela
     gluOrtho2D(0, WINDOW_WIDTH, 0, WINDOW_HEIGHT) #sistema de coordenadas
+    initTexto()
+    initGeometria()
 
-def desenhaPC(x, y, scale=1.0, active=False): #active é pra mudar a cor do pc caso ele esteja ativo no momento da animação
-    glPushMatrix()
-    glTranslatef(x, y, 0)
-    glScalef(scale, scale, 1)
+def initTexto(): #compila cada glifo da fonte bitmap numa display list, uma vez só
+    global baseFonte
+    baseFonte = glGenLists(256)
+    for c in range(256):
+        glNewList(baseFonte + c, GL_COMPILE)
+        glutBitmapCharacter(GLUT_BITMAP_HELVETICA_12, c)
+        glEndList()
+    for texto in LEGENDAS: #legendas fixas já viram uma lista cada
+        listaTexto(texto)
+
+def listaTexto(texto): #display list com a string toda, emitida num único glCallLists
+    lista = listasTexto.get(texto)
+    if lista is None:
+        lista = glGenLists(1)
+        glNewList(lista, GL_COMPILE)
+        glListBase(baseFonte)
+        glCallLists(texto.encode("latin-1", "replace"))
+        glEndList()
+        listasTexto[texto] = lista
+    return lista
+
+def initGeometria(): #modelos compilados uma vez, cada instância só muda transformação e cor
+    global listaPC, listaTela, listaHexagono
+    listaPC = glGenLists(3)
+    listaTela = listaPC + 1
+    listaHexagono = listaPC + 2
     
+    glNewList(listaPC, GL_COMPILE) #gabinete + moldura do monitor
     glColor3f(0.3, 0.3, 0.3)
     glBegin(GL_QUADS)
     glVertex2f(-30, -50)
@@ -54,17 +95,54 @@ def desenhaPC(x, y, scale=1.0, active=False): #active é pra mudar a cor do pc c
     glVertex2f(60, 120)
     glVertex2f(-60, 120)
     glEnd()
+    glEndList()
     
-    if active:
-        glColor3f(0.8, 1.0, 0.8)
-    else:
-        glColor3f(0.1, 0.1, 0.1)
+    glNewList(listaTela, GL_COMPILE) #tela sem cor, a cor vem de quem chama
     glBegin(GL_QUADS)
     glVertex2f(-50, 70)
     glVertex2f(50, 70)
     glVertex2f(50, 110)
     glVertex2f(-50, 110)
     glEnd()
+    glEndList()
+    
+    glNewList(listaHexagono, GL_COMPILE) #hexagono de raio 1, o seno/cosseno só é calculado aqui
+    glBegin(GL_POLYGON)
+    for j in range(6):
+        angulo = math.radians(60 * j)
+        glVertex2f(math.cos(angulo), math.sin(angulo))
+    glEnd()
+    glEndList()
+
+def listaCamadas(nivelCor): #pilha de hexagonos de uma combinação de cores, compilada na primeira vez
+    chave = tuple(nivelCor)
+    lista = listasCamadas.get(chave)
+    if lista is None:
+        lista = glGenLists(1)
+        glNewList(lista, GL_COMPILE)
+        raioNivel = 40
+        for i, cor in enumerate(nivelCor):
+            raio = raioNivel - i * 6
+            glColor3f(*cor)
+            glPushMatrix()
+            glScalef(raio, raio, 1)
+            glCallList(listaHexagono)
+            glPopMatrix()
+        glEndList()
+        listasCamadas[chave] = lista
+    return lista
+
+def desenhaPC(x, y, scale=1.0, active=False): #active é pra mudar a cor do pc caso ele esteja ativo no momento da animação
+    glPushMatrix()
+    glTranslatef(x, y, 0)
+    glScalef(scale, scale, 1)
+    
+    glCallList(listaPC)
+    if active:
+        glColor3f(0.8, 1.0, 0.8)
+    else:
+        glColor3f(0.1, 0.1, 0.1)
+    glCallList(listaTela)
     
     glPopMatrix()
 
@@ -73,31 +151,21 @@ def desenhaMensagem(x, y, texto, nivelCor=None, rotation=0):
     glTranslatef(x, y, 0)
     glRotatef(rotation, 0, 0, 1)
     
-    if nivelCor: #desenha as camadas em hexagonos, a cor é passada aqui
-        raioNivel = 40
-        for i, cor in enumerate(nivelCor):
-            glColor3f(*cor)
-            raio = raioNivel - i * 6
-            glBegin(GL_POLYGON)
-            for j in range(6):
-                angulo = math.radians(60 * j)
-                glVertex2f(math.cos(angulo) * raio, math.sin(angulo) * raio)
-            glEnd()
+    if nivelCor: #desenha as camadas em hexagonos, uma display list por combinação de cores
+        glCallList(listaCamadas(nivelCor))
 
     glColor3f(0, 0, 0)
     glRasterPos2f(-len(texto)*4, -5)
-    for char in texto:
-        glutBitmapCharacter(GLUT_BITMAP_HELVETICA_12, ord(char))
+    glCallList(listaTexto(texto))
     
     glPopMatrix()
 
 def escreveTexto(x, y, texto):
     glColor3f(0, 0, 0)
     glRasterPos2f(x, y)
-    for char in texto:
-        glutBitmapCharacter(GLUT_BITMAP_HELVETICA_12, ord(char))
+    glCallList(listaTexto(texto))
 
-def atualizaAnimacao():
+def atualizaAnimacao(valor=0): #timer do GLUT: parado em IDLE não reagenda, então não gasta CPU
     global estadoAtual, progressoAnimacao
     
     if estadoAtual != ESTADOS["IDLE"]: #avança até chegar em 100%, aí passa pra outra camada
@@ -107,6 +175,9 @@ def atualizaAnimacao():
             estadoAtual += 1
     
     glutPostRedisplay()
+    #depois da FISICA o estado passa do último e a tela não muda mais (igual a antes): para de reagendar
+    if ESTADOS["IDLE"] < estadoAtual <= ESTADOS["FISICA"]:
+        glutTimerFunc(INTERVALO_MS, atualizaAnimacao, 0)
 
 def display():
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
@@ -153,6 +224,7 @@ def teclado(key, x, y):
     if key == b' ' and estadoAtual == ESTADOS["IDLE"]:
         estadoAtual = ESTADOS["APLICACAO"]
         progressoAnimacao = 0
+        glutTimerFunc(INTERVALO_MS, atualizaAnimacao, 0)
     elif key == b'\x1b': #esc
         sys.exit(0)
     
@@ -168,7 +240,6 @@ def main():
     
     glutDisplayFunc(display)
     glutKeyboardFunc(teclado)
-    glutIdleFunc(atualizaAnimacao)
     
     glutMainLoop()
 
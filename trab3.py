@@ -2,8 +2,10 @@ import numpy as np
 import glfw
 from OpenGL.GL import *
 import OpenGL.GL.shaders as shaders
+import ctypes
 import math
 import sys
+from relogio import TIMEOUT_OCIOSO
 
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
@@ -281,6 +283,7 @@ class Renderer:
 class Application:
     def __init__(self):
         self.renderer = None
+        self.sujo = True #redesenha mesmo parado (tecla, janela exposta)
         
     def init(self):
         if not glfw.init(): #inicia glfw
@@ -301,6 +304,7 @@ class Application:
         glfw.make_context_current(self.window) #faz a janela atual
         
         glfw.set_key_callback(self.window, self.key_callback) #configura callback
+        glfw.set_window_refresh_callback(self.window, self.refresh_callback)
         
         glViewport(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT) #configura openGL
         glClearColor(*BRANCO)
@@ -322,13 +326,19 @@ class Application:
         
         #loop principal
         while not glfw.window_should_close(self.window):
-            glfw.poll_events()
+            if estadoAtual != ESTADOS["IDLE"]:
+                glfw.poll_events()
+            else: #parado, dorme até chegar evento em vez de girar o loop
+                glfw.wait_events_timeout(TIMEOUT_OCIOSO)
             
-            self.update()
+            ativo = estadoAtual != ESTADOS["IDLE"]
+            if ativo:
+                self.update()
             
-            self.render()
-            
-            glfw.swap_buffers(self.window)
+            if ativo or self.sujo: #só redesenha se algo mudou
+                self.render()
+                glfw.swap_buffers(self.window)
+                self.sujo = False
 
         glfw.terminate()
     
@@ -376,10 +386,14 @@ class Application:
             self.renderer.desenha_mensagem(150, 200, mensagem, nivelCor)
             self.renderer.escreve_texto(texto_info, 90, 425)
     
+    def refresh_callback(self, window):
+        self.sujo = True
+    
     def key_callback(self, window, key, scancode, action, mods):
         global estadoAtual, progressoAnimacao
         
         if action == glfw.PRESS:
+            self.sujo = True
             if key == glfw.KEY_SPACE and estadoAtual == ESTADOS["IDLE"]:
                 estadoAtual = ESTADOS["APLICACAO"]
                 progressoAnimacao = 0
@@ -2,9 +2,10 @@ import numpy as np
 import glfw
 from OpenGL.GL import *
 import OpenGL.GL.shaders as shaders
-import math
 import sys
-import ctypes
+from lote import LoteFormas
+from estado_gl import EstadoGL
+from relogio import TIMEOUT_OCIOSO
 
 # -------------------------- Janela -------------------------- #
 WINDOW_WIDTH  = 800
@@ -20,6 +21,12 @@ AMARELO = np.array([1.0, 1.0, 0.0, 1.0], dtype=np.float32)
 CIANO   = np.array([0.0, 1.0, 1.0, 1.0], dtype=np.float32)  # não usado
 MAGENTA = np.array([1.0, 0.0, 1.0, 1.0], dtype=np.float32)
 
+# cores fixas do PC (criadas uma vez, não a cada frame)
+COR_GABINETE = np.array([0.3, 0.3, 0.3, 1.0], dtype=np.float32)
+COR_MONITOR  = np.array([0.2, 0.2, 0.2, 1.0], dtype=np.float32)
+COR_TELA_ON  = np.array([0.8, 1.0, 0.8, 1.0], dtype=np.float32)
+COR_TELA_OFF = np.array([0.1, 0.1, 0.1, 1.0], dtype=np.float32)
+
 # ------------------- Estados da animação -------------------- #
 ESTADOS = {
     "IDLE"        : 0,  # parado
@@ -39,6 +46,23 @@ ESTADOS = {
     "DONE"        : 11  # fim → volta para IDLE
 }
 
+# camadas da mensagem em cada estado (tuplas constantes, montadas uma vez)
+CORES_POR_ESTADO = {
+    ESTADOS["APLICACAO"]  : (VERDE,),
+    ESTADOS["DTRANSPORTE"]: (VERDE,),
+    ESTADOS["TRANSPORTE"] : (AZUL, VERDE),
+    ESTADOS["DREDE"]      : (AZUL, VERDE),
+    ESTADOS["REDE"]       : (AMARELO, AZUL, VERDE),
+    ESTADOS["DENLACE"]    : (AMARELO, AZUL, VERDE),
+    ESTADOS["ENLACE"]     : (VERMELHO, AMARELO, AZUL, VERDE),
+    ESTADOS["DFISICA"]    : (VERMELHO, AMARELO, AZUL, VERDE),
+    ESTADOS["FISICA"]     : (MAGENTA, VERMELHO, AMARELO, AZUL, VERDE),
+    ESTADOS["MOVE"]       : (MAGENTA, VERMELHO, AMARELO, AZUL, VERDE),
+}
+
+def cores_por_estado(st):
+    return CORES_POR_ESTADO.get(st, ())
+
 # ---------------- Variáveis globais ---------------- #
 estadoAtual        = ESTADOS["IDLE"]     # estado inicial
 progressoAnimacao  = 0.0                 # 0–1 dentro do estado
@@ -47,102 +71,21 @@ mensagem_x         = 150                 # posição x do “pacote”
 mensagem_y         = 200                 # posição y fixo
 destino_x          = 650                 # x sobre PC direito
 
-# ----------------- Shaders GLSL ----------------- #
-vertex_shader = """
-#version 330 core
-layout (location = 0) in vec2 position;
-uniform mat4 model;
-uniform mat4 projection;
-void main()
-{
-    gl_Position = projection * model * vec4(position, 0.0, 1.0);
-}
-"""
-
-fragment_shader = """
-#version 330 core
-out vec4 fragColor;
-uniform vec4 color;
-void main()
-{
-    fragColor = color;
-}
-"""
-
 # ============================================================ #
 #                           Renderer                           #
 # ============================================================ #
 class Renderer:
     def __init__(self):
         self.shader      = None
-        self.quad_vao    = None
-        self.hexagon_vao = None
+        self.estado      = EstadoGL()   # pula binds/useProgram repetidos
+        self.lote        = LoteFormas(estado=self.estado)
         self.projection  = None
 
     # -------- Compilação de shaders e matriz de projeção ------ #
     def init_shaders(self):
-        self.shader = shaders.compileProgram(
-            shaders.compileShader(vertex_shader,   GL_VERTEX_SHADER),
-            shaders.compileShader(fragment_shader, GL_FRAGMENT_SHADER)
-        )
         self.projection = self._ortho(0, WINDOW_WIDTH, 0, WINDOW_HEIGHT)
-        glUseProgram(self.shader)
-        glUniformMatrix4fv(
-            glGetUniformLocation(self.shader, "projection"),
-            1, GL_FALSE, self.projection
-        )
-
-    # ---------------- Criação de buffers ---------------- #
-    def init_buffers(self):
-        # ---- Quadrado ---- #
-        self.quad_vao = glGenVertexArrays(1)
-        quad_vbo      = glGenBuffers(1)
-
-        quad_vertices = np.array([
-            -0.5, -0.5,
-             0.5, -0.5,
-             0.5,  0.5,
-            -0.5,  0.5
-        ], dtype=np.float32)
-        quad_idx = np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)
-
-        glBindVertexArray(self.quad_vao)
-        glBindBuffer(GL_ARRAY_BUFFER, quad_vbo)
-        glBufferData(GL_ARRAY_BUFFER, quad_vertices.nbytes, quad_vertices, GL_STATIC_DRAW)
-
-        ebo = glGenBuffers(1)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
-        glBufferData(GL_ELEMENT_ARRAY_BUFFER, quad_idx.nbytes, quad_idx, GL_STATIC_DRAW)
-
-        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 2*4, ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-
-        # ---- Hexágono (centro + 6 vértices) ---- #
-        self.hexagon_vao = glGenVertexArrays(1)
-        hex_vbo          = glGenBuffers(1)
-
-        hex_vertices = [0.0, 0.0]  # centro
-        hex_idx      = []
-        for i in range(6):
-            ang = math.radians(60*i)
-            hex_vertices += [math.cos(ang), math.sin(ang)]
-            # triângulos tipo “pizza”
-            hex_idx += [0, i+1, i+2] if i < 5 else [0, i+1, 1]
-
-        hex_vertices = np.array(hex_vertices, dtype=np.float32)
-        hex_idx      = np.array(hex_idx, dtype=np.uint32)
-
-        glBindVertexArray(self.hexagon_vao)
-        glBindBuffer(GL_ARRAY_BUFFER, hex_vbo)
-        glBufferData(GL_ARRAY_BUFFER, hex_vertices.nbytes, hex_vertices, GL_STATIC_DRAW)
-
-        ebo = glGenBuffers(1)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
-        glBufferData(GL_ELEMENT_ARRAY_BUFFER, hex_idx.nbytes, hex_idx, GL_STATIC_DRAW)
-
-        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 2*4, ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-        glBindVertexArray(0)  # limpa
+        self.lote.init_gl(self.projection)
+        self.shader = self.lote.shader
 
     # -------- Matriz ortográfica (0…px) para 2D -------- #
     def _ortho(self, l, r, b, t):
@@ -155,32 +98,22 @@ class Renderer:
         ortho[2, 2] = -1.0
         return ortho
 
-    # -------- Função genérica para desenhar shape -------- #
-    def _draw(self, vao, count, x, y, sx, sy, cor):
-        glUseProgram(self.shader)
-        model = np.identity(4, dtype=np.float32)
-        model[0, 0] = sx
-        model[1, 1] = sy
-        model[3, 0] = x
-        model[3, 1] = y
-        glUniformMatrix4fv(glGetUniformLocation(self.shader, "model"), 1, GL_FALSE, model)
-        glUniform4fv(glGetUniformLocation(self.shader, "color"), 1, cor)
-        glBindVertexArray(vao)
-        glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, None)
-        glBindVertexArray(0)
-
-    # ---- Envelopes de uso fácil ---- #
+    # ---- Envelopes de uso fácil (vão para o lote do frame) ---- #
     def desenha_quad(self, x, y, w, h, cor):
-        self._draw(self.quad_vao, 6,  x, y, w, h, cor)
+        self.lote.quad(x, y, w, h, cor)
 
     def desenha_hexagono(self, x, y, r, cor):
-        self._draw(self.hexagon_vao, 18, x, y, r, r, cor)
+        self.lote.hexagono(x, y, r, cor)
+
+    # -------- Envia o lote acumulado (uma chamada de desenho) -------- #
+    def flush(self):
+        self.lote.flush()
 
     # ------------ “Computador” estilizado ------------ #
     def desenha_pc(self, x, y, scale=1.0, ativo=False):
-        self.desenha_quad(x, y, 60*scale, 100*scale, np.array([0.3, 0.3, 0.3, 1.0], dtype=np.float32))
-        self.desenha_quad(x, y+90*scale, 120*scale, 60*scale, np.array([0.2, 0.2, 0.2, 1.0], dtype=np.float32))
-        cor_tela = np.array([0.8, 1.0, 0.8, 1.0], dtype=np.float32) if ativo else np.array([0.1, 0.1, 0.1, 1.0], dtype=np.float32)
+        self.desenha_quad(x, y, 60*scale, 100*scale, COR_GABINETE)
+        self.desenha_quad(x, y+90*scale, 120*scale, 60*scale, COR_MONITOR)
+        cor_tela = COR_TELA_ON if ativo else COR_TELA_OFF
         self.desenha_quad(x, y+90*scale, 100*scale, 40*scale, cor_tela)
 
     # ------ Desenha a mensagem com N hexágonos ------ #
@@ -195,6 +128,7 @@ class Renderer:
 class Application:
     def __init__(self):
         self.renderer = None
+        self.sujo     = True   # precisa redesenhar mesmo sem animação (tecla, expose…)
 
     # ------ Inicializa GLFW + contexto OpenGL ------ #
     def init(self):
@@ -214,6 +148,12 @@ class Application:
 
         glfw.make_context_current(self.window)
         glfw.set_key_callback(self.window, self.key_callback)
+        glfw.set_window_refresh_callback(self.window, self.refresh_callback)
+        self.init_gl()
+        return True
+
+    # ------ Estado GL + Renderer (com qualquer contexto já corrente) ------ #
+    def init_gl(self):
         glViewport(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
         glClearColor(*BRANCO)
         glEnable(GL_BLEND)
@@ -221,19 +161,35 @@ class Application:
 
         self.renderer = Renderer()
         self.renderer.init_shaders()
-        self.renderer.init_buffers()
-        return True
 
     # ---------------- Loop principal ---------------- #
     def run(self):
         print("ESPAÇO = iniciar | R = reset | ESC = sair")
         while not glfw.window_should_close(self.window):
-            glfw.poll_events()
-            self.update()
-            self.render()
-            glfw.swap_buffers(self.window)
+            if self.animando():
+                glfw.poll_events()
+            else:
+                # parado: dorme até chegar evento (ou o timeout)
+                glfw.wait_events_timeout(TIMEOUT_OCIOSO)
+            ativo = self.animando()
+            if ativo:
+                self.update()
+            # redesenha só com animação, tecla/transição ou pedido do sistema de janelas
+            if ativo or self.sujo:
+                self.render()
+                glfw.swap_buffers(self.window)
+                self.sujo = False
         glfw.terminate()
 
+    def animando(self):
+        return estadoAtual != ESTADOS["IDLE"]
+
+    def inicia(self):
+        global estadoAtual, progressoAnimacao, mensagem_x
+        estadoAtual       = ESTADOS["APLICACAO"]
+        progressoAnimacao = 0.0
+        mensagem_x        = 150
+
     # ------------- Atualiza lógica/estados ------------- #
     def update(self):
         global estadoAtual, progressoAnimacao, mensagem_x
@@ -268,6 +224,7 @@ class Application:
 
     # ------------------ Desenha cena ------------------ #
     def render(self):
+        self.renderer.estado.novo_frame()
         glClear(GL_COLOR_BUFFER_BIT)
 
         # Telas ativas conforme estado
@@ -277,27 +234,22 @@ class Application:
         self.renderer.desenha_pc(150, 300, 1.0, ativo_esq)   # PC esquerdo
         self.renderer.desenha_pc(650, 300, 1.0, ativo_dir)   # PC direito
 
-        # Seleciona cores por estado
-        def cores_por_estado(st):
-            if st in (ESTADOS["APLICACAO"], ESTADOS["DTRANSPORTE"]):  return [VERDE]
-            if st in (ESTADOS["TRANSPORTE"], ESTADOS["DREDE"]):       return [AZUL, VERDE]
-            if st in (ESTADOS["REDE"],       ESTADOS["DENLACE"]):     return [AMARELO, AZUL, VERDE]
-            if st in (ESTADOS["ENLACE"],     ESTADOS["DFISICA"]):     return [VERMELHO, AMARELO, AZUL, VERDE]
-            if st in (ESTADOS["FISICA"], ESTADOS["MOVE"]):            return [MAGENTA, VERMELHO, AMARELO, AZUL, VERDE]
-            return []
-
         if estadoAtual != ESTADOS["IDLE"]:
             self.renderer.desenha_mensagem(mensagem_x, mensagem_y, cores_por_estado(estadoAtual))
 
+        self.renderer.flush()
+
     # ---------------- Callback de teclado ---------------- #
+    def refresh_callback(self, window):
+        self.sujo = True
+
     def key_callback(self, window, key, scancode, action, mods):
         global estadoAtual, progressoAnimacao, mensagem_x
         if action != glfw.PRESS:
             return
+        self.sujo = True
         if key == glfw.KEY_SPACE and estadoAtual == ESTADOS["IDLE"]:
-            estadoAtual       = ESTADOS["APLICACAO"]
-            progressoAnimacao = 0.0
-            mensagem_x        = 150
+            self.inicia()
             print("Iniciando animação...")
         elif key == glfw.KEY_R:
             estadoAtual       = ESTADOS["IDLE"]
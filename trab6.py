@@ -2,11 +2,22 @@ import numpy as np
 import glfw
 from OpenGL.GL import *
 import OpenGL.GL.shaders as shaders
-import math
 import sys
-import ctypes
+import time
+import argparse
 import pygame
 from pygame import freetype
+from texto import AtlasGlifos, TextoGL
+from lote import LoteFormas, CenaEstatica, QUAD, HEXAGONO
+from estado_gl import EstadoGL
+from relogio import RelogioFixo, PASSO_SIM, TIMEOUT_OCIOSO
+from linha_tempo import LinhaTempo, caminho_padrao
+from instrumenta import Instrumentacao
+from hud import HUD, MedidorFrames
+from pacotes import Pacotes, PacotesGL
+from fundo import FundoCache
+from topologia import Topologia, laboratorio, SWITCH, ROTEADOR, caminho_padrao as caminho_topologia
+from metricas import MetricasFrames, INTERVALO_ESCRITA
 
 # -------------------------- Janela -------------------------- #
 WINDOW_WIDTH  = 800
@@ -23,6 +34,16 @@ MAGENTA  = np.array([1.0, 0.0, 1.0, 1.0], dtype=np.float32)   # Física
 
 # cores da pilha (de baixo p/ cima: Física → Aplicação)
 LAYERS_COLORS = [MAGENTA, VERMELHO, AMARELO, AZUL, VERDE]
+# ordem fixa de anéis da mensagem: Aplicação (verde) … Física (magenta)
+RING_ORDER    = (VERDE, AZUL, AMARELO, VERMELHO, MAGENTA)
+
+# cores fixas do PC (criadas uma vez, não a cada frame)
+COR_MONITOR  = np.array([0.2, 0.2, 0.2, 1.0], dtype=np.float32)
+COR_TELA_ON  = np.array([0.8, 1.0, 0.8, 1.0], dtype=np.float32)
+COR_TELA_OFF = np.array([0.1, 0.1, 0.1, 1.0], dtype=np.float32)
+COR_CABO     = np.array([0.35, 0.35, 0.35, 1.0], dtype=np.float32)
+COR_SWITCH   = np.array([0.25, 0.35, 0.55, 1.0], dtype=np.float32)
+COR_ROTEADOR = np.array([0.55, 0.30, 0.15, 1.0], dtype=np.float32)
 
 # ------------------- Estados da animação -------------------- #
 ESTADOS = {
@@ -43,100 +64,58 @@ ESTADOS = {
     "DONE"        : 11  # fim → volta para IDLE
 }
 
+# etapas (duração, legenda, camadas, lugar) vêm de linha_tempo_trab6.json; os
+# lugares ("esq.rede", "rota"…) saem da topologia (lugares_aula)
+PALETA = {"VERDE": VERDE, "AZUL": AZUL, "AMARELO": AMARELO, "VERMELHO": VERMELHO, "MAGENTA": MAGENTA}
+ARQ_LINHA = caminho_padrao("trab6")
+
+# barra de busca (aparece pausado): marcas no começo de cada etapa
+BARRA_X0, BARRA_LARG, BARRA_Y = 50, 700, 588
+BUSCA_PASSOS = 60               # ←/→ andam 1 s (Shift: 10 s)
+COR_BARRA    = (0.8, 0.8, 0.8, 1.0)
+COR_ANDADO   = (0.3, 0.3, 0.3, 1.0)
+
+# tráfego (tecla N): pacotes extras entre hosts quaisquer da topologia
+QUANTIDADES_TRAFEGO = (0, 100, 1000, 10000)
+
+# textos fixos do IDLE: vão junto com a camada de fundo
+TEXTOS_IDLE = ((200, 500, "Pressione ESPACO para iniciar a animacao"),
+               (150, 470, "Visualizacao do encapsulamento de pacotes"))
+
 # ---------------- Variáveis globais ---------------- #
-current_msg = ""
-estadoAtual        = ESTADOS["IDLE"]
-progressoAnimacao  = 0.0
-velocidadeAnimacao = 0.002
+estadoAtual   = ESTADOS["IDLE"]
+passoAnimacao = 0.0             # passos de simulação desde o início da animação
 
 # configurações de camadas
 altura_faixa = 20
 gap          = 2
-# posições verticais das 5 camadas (0=Física,...,4=Aplicação)
-y_positions = [300 + (-50 + i*(altura_faixa + gap)) for i in range(5)]
-
-# posição inicial (ao lado do retângulo verde Aplicação)
-mensagem_start_x = 150 + 30 + 40
-mensagem_x       = mensagem_start_x
-mensagem_y       = y_positions[4]
-
-mensagem_angulo = 0.0          # graus
-velocidade_rot  = 5.0          # graus por frame
-
-# destino horizontal (ao lado do PC direito)
-destino_x = 650 - (30 + 40)
-
-waypoints = [
-    # ---------- DESCIDA  (PC esquerdo) ----------
-    (mensagem_start_x, y_positions[4], VERDE    , "Camada de Aplicação: Dados da aplicação(Mensagem Original)"),
-    (mensagem_start_x, y_positions[3], AZUL    , "Camada Transporte: cabeçalho TCP/UDP"),
-    (mensagem_start_x, y_positions[2], AMARELO , "Camada Rede: cabeçalho IP"),
-    (mensagem_start_x, y_positions[1], VERMELHO, "Camada Enlace: cabeçalho Ethernet"),
-    (mensagem_start_x, y_positions[0], MAGENTA , "Camada Física: sinais elétricos"),
-
-    # ---------- TRAVESSIA ----------
-    # (1) ponto de partida – mostra a mensagem ENVIANDO e já começa a mover
-    (mensagem_start_x, y_positions[0], None    , "Enviando pela rede…"),
-    # (2) ponto de chegada na frente do PC direito – muda para RECEBENDO
-    (destino_x       , y_positions[0], None    , "Recebendo na Física: conversão de sinais"),
-
-    # ---------- SUBIDA  (PC direito) ----------
-    (destino_x       , y_positions[1], None , "Desencaps. Enlace: remove Ethernet"),
-    (destino_x       , y_positions[2], None , "Desencaps. Rede : remove IP"),
-    (destino_x       , y_positions[3], None , "Desencaps. Transp: remove TCP"),
-    (destino_x       , y_positions[4], None , "Aplicação destino: mensagem recebida!")
-]
-waypoint_idx = 0
-IDX_SUBIDA = 7
-acquired_colors = [VERDE]
-# track origem do segmento atual
-segment_start_x = mensagem_x
-segment_start_y = mensagem_y
-
-# ----------------- Shaders GLSL ----------------- #
-color_vertex_shader = """
-#version 330 core
-layout (location = 0) in vec2 position;
-uniform mat4 model;
-uniform mat4 projection;
-void main() {
-    gl_Position = projection * model * vec4(position, 0.0, 1.0);
-}
-"""
-
-color_fragment_shader = """
-#version 330 core
-out vec4 fragColor;
-uniform vec4 color;
-void main() {
-    fragColor = color;
-}
-"""
-
-text_vertex_shader = """
-#version 330 core
-layout (location = 0) in vec2 position;
-layout (location = 1) in vec2 texCoord;
-uniform mat4 model;
-uniform mat4 projection;
-out vec2 TexCoord;
-void main() {
-    gl_Position = projection * model * vec4(position, 0.0, 1.0);
-    TexCoord = texCoord;
-}
-"""
-
-text_fragment_shader = """
-#version 330 core
-in vec2 TexCoord;
-out vec4 fragColor;
-uniform sampler2D text;
-uniform vec4 color;
-void main() {
-    vec4 sampled = texture(text, TexCoord);
-    fragColor = vec4(color.rgb, 1.0) * sampled;
-}
-"""
+
+# a mensagem da aula fica ao lado da pilha do host, na altura de cada camada
+CAMADAS_PC    = ("fisica", "enlace", "rede", "transporte", "aplicacao")   # mesma ordem de LAYERS_COLORS
+AFASTA_PACOTE = 70
+
+
+def lugares_aula(topo):
+    """
+    Lugares da linha do tempo para esta topologia: "esq.<camada>" e
+    "dir.<camada>" ao lado dos hosts da aula e "rota", o caminho (pelas
+    portas dos nós da rota) da Física do host esq até a Física do dir.
+    """
+    esq, dir_ = topo.aula
+    if esq is None or dir_ is None:
+        raise ValueError("a topologia precisa de \"aula\" com os hosts esq e dir")
+    e = topo.escala
+    lugares = {}
+    for lado, no, sinal in (("esq", esq, 1), ("dir", dir_, -1)):
+        for i, camada in enumerate(CAMADAS_PC):
+            lugares[f"{lado}.{camada}"] = (topo.x[no] + sinal * AFASTA_PACOTE * e,
+                                           topo.y[no] + (-50 + i * (altura_faixa + gap)) * e)
+    caminho = topo.caminho(esq, dir_)
+    if not caminho:
+        raise ValueError(f"sem rota entre {topo.nomes[esq]} e {topo.nomes[dir_]}")
+    px, py = topo.portas()
+    lugares["rota"] = [(px[n], py[n]) for n in caminho[1:-1]] + [lugares["dir.fisica"]]
+    return lugares
 
 # ============================================================ #
 #                           Renderer                           #
@@ -145,65 +124,32 @@ class Renderer:
     def __init__(self):
         self.color_shader = None
         self.text_shader  = None
-        self.quad_vao     = None
-        self.hexagon_vao  = None
+        self.estado       = EstadoGL()   # pula binds/useProgram repetidos
+        self.texto        = TextoGL(AtlasGlifos.carrega(), self.estado)
+        self.lote         = LoteFormas(estado=self.estado)
+        self.cena         = CenaEstatica(self.estado)   # topologia assada (modo retido)
+        self._cena_de     = None          # (id, versao) da topologia assada
+        self._telas_aula  = (None, None)  # índice das telas esq/dir na cena
+        self._telas       = (False, False)
+        self.fundo        = FundoCache(self.estado)      # limpa + topologia + textos fixos
+        self.tamanho      = (WINDOW_WIDTH, WINDOW_HEIGHT)   # framebuffer, em pixels
+        self.pacotes      = PacotesGL(RING_ORDER, self.estado)
+        self.hud          = HUD(self)
         self.projection   = None
 
     def init_shaders(self):
-        self.color_shader = shaders.compileProgram(
-            shaders.compileShader(color_vertex_shader, GL_VERTEX_SHADER),
-            shaders.compileShader(color_fragment_shader, GL_FRAGMENT_SHADER)
-        )
-        self.text_shader = shaders.compileProgram(
-            shaders.compileShader(text_vertex_shader, GL_VERTEX_SHADER),
-            shaders.compileShader(text_fragment_shader, GL_FRAGMENT_SHADER)
-        )
         self.projection = self._ortho(0, WINDOW_WIDTH, 0, WINDOW_HEIGHT)
-        glUseProgram(self.color_shader)
-        glUniformMatrix4fv(glGetUniformLocation(self.color_shader, "projection"), 1, GL_FALSE, self.projection)
-        glUseProgram(self.text_shader)
-        glUniformMatrix4fv(glGetUniformLocation(self.text_shader, "projection"), 1, GL_FALSE, self.projection)
+        self.lote.init_gl(self.projection)
+        self.color_shader = self.lote.shader
+        self.cena.init_gl(self.projection, self.lote.programa)
+        self._cena_de = None
+        self.texto.init_gl(self.projection)
+        self.text_shader = self.texto.shader
 
     def init_buffers(self):
-        # Quad
-        self.quad_vao = glGenVertexArrays(1)
-        quad_vbo = glGenBuffers(1)
-        quad_vertices = np.array([-0.5, -0.5,
-                                   0.5, -0.5,
-                                   0.5,  0.5,
-                                  -0.5,  0.5], dtype=np.float32)
-        quad_idx = np.array([0,1,2, 0,2,3], dtype=np.uint32)
-        glBindVertexArray(self.quad_vao)
-        glBindBuffer(GL_ARRAY_BUFFER, quad_vbo)
-        glBufferData(GL_ARRAY_BUFFER, quad_vertices.nbytes, quad_vertices, GL_STATIC_DRAW)
-        ebo = glGenBuffers(1)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
-        glBufferData(GL_ELEMENT_ARRAY_BUFFER, quad_idx.nbytes, quad_idx, GL_STATIC_DRAW)
-        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 2*4, ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-        # Hexágono
-        self.hexagon_vao = glGenVertexArrays(1)
-        hex_vbo = glGenBuffers(1)
-        vertices = [0.0, 0.0]
-        indices = []
-        for i in range(6):
-            ang = math.radians(60 * i)
-            vertices += [math.cos(ang), math.sin(ang)]
-            if i < 5:
-                indices += [0, i+1, i+2]
-            else:
-                indices += [0, i+1, 1]
-        vertices = np.array(vertices, dtype=np.float32)
-        indices  = np.array(indices,  dtype=np.uint32)
-        glBindVertexArray(self.hexagon_vao)
-        glBindBuffer(GL_ARRAY_BUFFER, hex_vbo)
-        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
-        ebo2 = glGenBuffers(1)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo2)
-        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
-        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 2*4, ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-        glBindVertexArray(0)
+        self.pacotes.init_gl(self.projection)
+        self.fundo.init_gl()
+        self.estado.invalida()  # binds acima foram direto no GL
 
     def _ortho(self, l, r, b, t):
         w, h = r-l, t-b
@@ -215,43 +161,9 @@ class Renderer:
         m[2,2] = -1.0
         return m
 
-    def _draw(self, vao, count, x, y, sx, sy, cor):
-        glUseProgram(self.color_shader)
-        model = np.identity(4, dtype=np.float32)
-        model[0,0] = sx
-        model[1,1] = sy
-        model[3,0] = x
-        model[3,1] = y
-        glUniformMatrix4fv(glGetUniformLocation(self.color_shader, "model"), 1, GL_FALSE, model)
-        glUniform4fv(glGetUniformLocation(self.color_shader, "color"), 1, cor)
-        glBindVertexArray(vao)
-        glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, None)
-        glBindVertexArray(0)
-
-    def _draw_rot(self, vao, count, x, y, scale, rot_deg, cor):
-        glUseProgram(self.color_shader)
-        model = np.identity(4, dtype=np.float32)
-        rad = math.radians(rot_deg)
-        c, s = math.cos(rad), math.sin(rad)
-        model[0,0] =  c*scale
-        model[0,1] = -s*scale
-        model[1,0] =  s*scale
-        model[1,1] =  c*scale
-        model[3,0] =  x
-        model[3,1] =  y
-        glUniformMatrix4fv(
-            glGetUniformLocation(self.color_shader, "model"),
-            1, GL_FALSE, model)
-        glUniform4fv(
-            glGetUniformLocation(self.color_shader, "color"),
-            1, cor)
-        glBindVertexArray(vao)
-        glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, None)
-        glBindVertexArray(0)
-
     # desenho de retângulo
     def desenha_quad(self, x, y, w, h, cor):
-        self._draw(self.quad_vao, 6, x, y, w, h, cor)
+        self.lote.quad(x, y, w, h, cor)
 
         # desenho de hexágono com bordas concêntricas de cores adquiridas
         # desenho de hexágono com bordas concêntricas de cores adquiridas
@@ -263,108 +175,150 @@ class Renderer:
         """
         base = 30 * scale
         step = 8 * scale
-        # ordem fixa de anéis: Aplicação (verde), Transporte (azul), Rede (amarelo), Enlace (vermelho), Física (magenta)
-        ring_order = [VERDE, AZUL, AMARELO, VERMELHO, MAGENTA]
         # desenhar maiores primeiro para que fiquem atrás
-        for idx in range(len(ring_order)-1, -1, -1):
-            layer_color = ring_order[idx]
-            tamanho = base + idx * step
-            
-            # verifica aquisição comparando arrays
-            acquired = any(np.array_equal(layer_color, c) for c in cores)
-            if acquired:
-                cor = layer_color
-            else:
-                cor = np.array([layer_color[0], layer_color[1], layer_color[2], 0.0], dtype=np.float32)
-            self._draw_rot(self.hexagon_vao, 18, x, y, tamanho, rot, cor)
-
-    def desenha_pc(self, x, y, scale=1.0, ativo=False):
+        for idx in range(len(RING_ORDER)-1, -1, -1):
+            layer_color = RING_ORDER[idx]
+            # as cores adquiridas são as próprias constantes da paleta: basta identidade.
+            # anel não adquirido é transparente, ou seja, não desenha nada
+            for c in cores:
+                if c is layer_color:
+                    self.lote.hexagono(x, y, base + idx * step, layer_color, rot)
+                    break
+
+    def desenha_pc(self, x, y, scale=1.0, ativo=False, lote=None):
         """
         Monitor + 5 faixas horizontais coloridas (camadas).
-        x,y: base do monitor (mesmo ponto usado antes).
+        x,y: base do monitor (mesmo ponto usado antes). Com arrays em x, y e
+        ativo, desenha vários PCs de uma vez. Devolve o índice da (primeira)
+        tela no lote, para repintar depois.
         """
+        lote = lote or self.lote
         # --------- monitor ----------
-        self.desenha_quad(x, y + 90*scale, 120*scale, 60*scale,
-                          np.array([0.2,0.2,0.2,1.0]))
-        cor_tela = np.array([0.8,1.0,0.8,1.0]) if ativo else \
-                   np.array([0.1,0.1,0.1,1.0])
-        self.desenha_quad(x, y + 90*scale, 100*scale, 40*scale, cor_tela)
+        lote.adiciona_varios(QUAD, x, y + 90*scale, 120*scale, 60*scale, COR_MONITOR)
+        cor_tela = np.where(np.asarray(ativo)[..., None], COR_TELA_ON, COR_TELA_OFF)
+        tela = lote.adiciona_varios(QUAD, x, y + 90*scale, 100*scale, 40*scale, cor_tela)
 
         # --------- pilha de 5 camadas ----------
         largura      = 60 * scale
         alt_faixa    = altura_faixa * scale
-        gap_s        = gap * scale
         for i, cor in enumerate(LAYERS_COLORS):      # Física=0 … Aplicação=4
-            cx = x
-            cy = -50 + y + i*(alt_faixa + gap_s)
-            self.desenha_quad(cx, cy, largura, alt_faixa, cor)
+            cy = y + (-50 + i*(altura_faixa + gap)) * scale
+            lote.adiciona_varios(QUAD, x, cy, largura, alt_faixa, cor)
+        return tela
+
+    def _assa_topologia(self, topo):
+        # cabos, switches, roteadores e hosts vão uma vez para a cena estática
+        cena, e = self.cena, topo.escala
+        cena.limpa()
+        cx, cy, comprimento, angulo = topo.cabos()
+        if len(cx):
+            cena.adiciona_varios(QUAD, cx, cy, comprimento, max(3 * e, 1.0), COR_CABO, angulo)
+        sw = topo.tipo == SWITCH
+        if sw.any():
+            cena.adiciona_varios(QUAD, topo.x[sw], topo.y[sw], 90 * e, 26 * e, COR_SWITCH)
+        rt = topo.tipo == ROTEADOR
+        if rt.any():
+            cena.adiciona_varios(HEXAGONO, topo.x[rt], topo.y[rt], 26 * e, 26 * e, COR_ROTEADOR)
+            cena.adiciona_varios(HEXAGONO, topo.x[rt], topo.y[rt], 12 * e, 12 * e, COR_MONITOR)
+        hosts = topo.hosts
+        if len(hosts):
+            tela0 = self.desenha_pc(topo.x[hosts], topo.y[hosts], e, False, lote=cena)
+            self._telas_aula = tuple(None if no is None else tela0 + int(np.searchsorted(hosts, no))
+                                     for no in topo.aula)
+        else:
+            self._telas_aula = (None, None)
+        self._telas = (False, False)
+        cena.assa()
+        self._cena_de = (id(topo), topo.versao)
+
+    def desenha_topologia(self, topo, tela_esq=False, tela_dir=False):
+        """
+        Cabos, switches, roteadores e hosts numa chamada só (cena estática,
+        assada de novo só se a topologia mudar). Por frame, só as telas da
+        aula são repintadas, e só quando acendem ou apagam.
+        """
+        if self._cena_de != (id(topo), topo.versao):
+            self._assa_topologia(topo)
+        telas = (bool(tela_esq), bool(tela_dir))
+        for forma, antes, agora in zip(self._telas_aula, self._telas, telas):
+            if forma is not None and antes != agora:
+                self.cena.pinta(forma, COR_TELA_ON if agora else COR_TELA_OFF)
+        self._telas = telas
+        self.flush()   # o que já foi submetido fica atrás
+        self.cena.desenha()
+
+    def desenha_fundo(self, topo, tela_esq=False, tela_dir=False, textos=()):
+        """
+        Camada estática (limpa + topologia + textos fixos) guardada numa
+        textura e copiada para a tela por frame; só é redesenhada quando
+        muda: telas da aula, textos, topologia ou tamanho do framebuffer.
+        """
+        chave = (id(topo), topo.versao, bool(tela_esq), bool(tela_dir), textos, self.tamanho)
+        if chave != self.fundo.chave:
+            self.fundo.comeca(*self.tamanho)
+            glClear(GL_COLOR_BUFFER_BIT)
+            self.desenha_topologia(topo, tela_esq, tela_dir)
+            for x, y, texto in textos:
+                self.escreve_texto(x, y, texto)
+            self.flush()
+            self.fundo.termina(chave)
+        self.fundo.desenha()
 
     
 
 
-    # texto (igual antes)
+    # envia as formas acumuladas no frame (uma chamada de desenho)
+    def flush(self):
+        self.lote.flush()
+
+    # barra de busca: fundo, parte já tocada e as marcas das etapas (um lote só)
+    def desenha_barra(self, fracao, marcas):
+        self.lote.quad(BARRA_X0 + BARRA_LARG / 2, BARRA_Y, BARRA_LARG, 6, COR_BARRA)
+        self.lote.quad(BARRA_X0 + BARRA_LARG * fracao / 2, BARRA_Y, BARRA_LARG * fracao, 6, COR_ANDADO)
+        self.lote.adiciona_varios(QUAD, marcas, BARRA_Y, 2, 12, PRETO)
+
+    # tráfego: todos os pacotes numa chamada instanciada
+    def desenha_pacotes(self, pacotes):
+        self.flush()   # o que já foi submetido fica atrás
+        self.pacotes.desenha(pacotes)
+
+    # HUD de desempenho por cima de tudo (tecla H)
+    def desenha_hud(self, medidor, objetos_gl):
+        self.hud.desenha(medidor, objetos_gl)
+
+    # texto: atlas de glifos + quads em lote (sem textura/VAO por frame)
     def escreve_texto(self, x, y, texto, cor=(0,0,0)):
-        from PIL import Image, ImageDraw, ImageFont
-        font = ImageFont.truetype("arial.ttf", 24)
-        bbox = font.getbbox(texto)
-        img = Image.new("RGBA", (bbox[2], bbox[3]), (0,0,0,0))
-        draw = ImageDraw.Draw(img)
-        draw.text((0,0), texto, font=font, fill=(int(cor[0]*255), int(cor[1]*255), int(cor[2]*255), 255))
-        data = img.transpose(Image.FLIP_TOP_BOTTOM).tobytes()
-        texture = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, texture)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, img.width, img.height, 0, GL_RGBA, GL_UNSIGNED_BYTE, data)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-        quad = np.array([x, y, x+img.width, y, x+img.width, y+img.height, x, y+img.height], dtype=np.float32)
-        uv   = np.array([0,0, 1,0, 1,1, 0,1], dtype=np.float32)
-        vao  = glGenVertexArrays(1)
-        vbo  = glGenBuffers(2)
-        glBindVertexArray(vao)
-        glBindBuffer(GL_ARRAY_BUFFER, vbo[0])
-        glBufferData(GL_ARRAY_BUFFER, quad.nbytes, quad, GL_STATIC_DRAW)
-        glVertexAttribPointer(0,2,GL_FLOAT,GL_FALSE,0,ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-        glBindBuffer(GL_ARRAY_BUFFER, vbo[1])
-        glBufferData(GL_ARRAY_BUFFER, uv.nbytes, uv, GL_STATIC_DRAW)
-        glVertexAttribPointer(1,2,GL_FLOAT,GL_FALSE,0,ctypes.c_void_p(0))
-        glEnableVertexAttribArray(1)
-        glUseProgram(self.text_shader)
-        model = np.identity(4, dtype=np.float32)
-        glUniformMatrix4fv(glGetUniformLocation(self.text_shader, "model"), 1, GL_FALSE, model)
-        glUniform4fv(glGetUniformLocation(self.text_shader, "color"), 1, np.append(cor, 1))
-        glUniform1i(glGetUniformLocation(self.text_shader, "text"), 0)
-        glActiveTexture(GL_TEXTURE0); glBindTexture(GL_TEXTURE_2D, texture)
-        glBindVertexArray(vao); glDrawArrays(GL_TRIANGLE_FAN, 0, 4)
-        glDeleteVertexArrays(1, [vao]); glDeleteBuffers(2, vbo); glDeleteTextures([texture])
+        self.flush()   # o que já foi submetido fica atrás do texto
+        self.texto.desenha(x, y, texto, cor)
 
 # ============================================================ #
 #                         Aplicação                           #
 # ============================================================ #
 
 
-# --------------- coloque antes da classe Application ---------------
+# ---------------- volta ao início (IDLE) ---------------- #
 def reset_estado():
-    global estadoAtual, progressoAnimacao, waypoint_idx
-    global mensagem_x, mensagem_y, segment_start_x, segment_start_y
-    global acquired_colors, mensagem_angulo, current_msg
-
-    estadoAtual        = ESTADOS["IDLE"]
-    progressoAnimacao  = 0.0
-    waypoint_idx       = 0
+    global estadoAtual, passoAnimacao
+    estadoAtual   = ESTADOS["IDLE"]
+    passoAnimacao = 0.0
 
-    mensagem_x         = mensagem_start_x
-    mensagem_y         = y_positions[4]
-    segment_start_x    = mensagem_x
-    segment_start_y    = mensagem_y
-
-    acquired_colors    = [VERDE]
-    mensagem_angulo    = 0.0
-    current_msg        = ""
-# -------------------------------------------------------------------
 
 class Application:
-    def __init__(self): self.renderer=None
+    def __init__(self, topologia=None):
+        self.renderer = None
+        self.relogio  = None
+        self.sujo     = True   # precisa redesenhar mesmo sem animação (tecla, expose…)
+        self.pausado  = False
+        self.instr    = None   # contador de chamadas GL (tecla I), criado sob demanda
+        self.medidor  = MedidorFrames()
+        self.hud_ligado = False
+        self.metricas = None   # MetricasFrames (--metricas-*), só quando pedido
+        # cena: hosts/switches/roteadores (--topologia, --laboratorio); a aula usa os hosts "esq"/"dir"
+        self.topologia = topologia or Topologia.carrega(caminho_topologia("trab6"))
+        self.trafego  = Pacotes(self.topologia)
+        self.linha    = LinhaTempo.carrega(ARQ_LINHA, ESTADOS, PALETA, lugares=lugares_aula(self.topologia))
+        # marcas da barra de busca: começo de cada etapa (os trechos de um caminho não contam)
+        self.marcas   = BARRA_X0 + BARRA_LARG * self.linha.inicio[~self.linha.continua] / self.linha.total
 
     def init(self):
         if not glfw.init(): return False
@@ -375,7 +329,17 @@ class Application:
         if not self.window:
             glfw.terminate(); return False
         glfw.make_context_current(self.window)
+        glfw.swap_interval(1)   # vsync: o ritmo vem do relógio, não do loop
         glfw.set_key_callback(self.window, self.key_callback)
+        glfw.set_mouse_button_callback(self.window, self.mouse_callback)
+        glfw.set_window_refresh_callback(self.window, self.refresh_callback)
+        glfw.set_framebuffer_size_callback(self.window, self.resize_callback)
+        self.init_gl()
+        self.relogio = RelogioFixo(glfw.get_time)
+        return True
+
+    # ------ Estado GL + Renderer (com qualquer contexto já corrente) ------ #
+    def init_gl(self):
         glViewport(0,0,WINDOW_WIDTH,WINDOW_HEIGHT)
         glClearColor(*BRANCO)
         glEnable(GL_BLEND)
@@ -384,142 +348,220 @@ class Application:
         self.renderer = Renderer()
         self.renderer.init_shaders()
         self.renderer.init_buffers()
-        return True
 
     # ---------------- Loop principal ---------------- #
-    def run(self):
-        print("ESPAÇO = iniciar | R = reset | ESC = sair")
+    def run(self, duracao=None, metricas=None):
+        print("ESPAÇO = iniciar | P = pausa | R = reset | I = conta GL | T = trace de um frame | H = HUD | N = tráfego | ESC = sair")
+        print("←/→ = volta/avança 1 s (Shift: 10 s) | HOME = início | pausado, clique na barra para buscar")
+        self.metricas = metricas
+        try:
+            self._loop(duracao)
+        finally:
+            if metricas is not None:
+                metricas.escreve()     # última foto, mesmo saindo por Ctrl+C
+            glfw.terminate()
+
+    def animando(self):
+        return (estadoAtual != ESTADOS["IDLE"] or self.trafego.n > 0) and not self.pausado
+
+    def inicia(self):
+        global estadoAtual
+        reset_estado()
+        estadoAtual = self.linha.estado_em(0)
+
+    def vai_para(self, passo):
+        """Pula direto para o passo da animação (sem rodar os anteriores); devolve o passo."""
+        global estadoAtual, passoAnimacao
+        passo = min(max(int(passo), 0), self.linha.total)
+        passoAnimacao = float(passo)
+        estadoAtual = self.linha.estado_em(passo) if passo < self.linha.total else ESTADOS["IDLE"]
+        self.sujo = True
+        return passo
+
+    def _loop(self, duracao=None):
+        fim = None if duracao is None else glfw.get_time() + duracao
+        relogio = time.perf_counter
         while not glfw.window_should_close(self.window):
-            glfw.poll_events()
-            self.update()
-            self.render()
-            glfw.swap_buffers(self.window)
-        glfw.terminate()
+            if fim is not None and glfw.get_time() >= fim:
+                break
+            t0 = relogio()
+            if self.animando():
+                glfw.poll_events()
+            else:
+                # nada se mexe: dorme até chegar evento (ou o timeout)
+                glfw.wait_events_timeout(TIMEOUT_OCIOSO)
+                self.relogio.reinicia()
+                self.sujo |= self.hud_ligado     # HUD aceso: atualiza a cada timeout
+            t1 = relogio()
+            ativo = self.animando()
+            if ativo:
+                for _ in range(self.relogio.passos()):   # passo fixo, com teto de alcance
+                    self.update()
+            t2 = relogio()
+            # redesenha só com animação, tecla/transição ou pedido do sistema de janelas
+            if ativo or self.sujo:
+                self.render(self.relogio.alfa if ativo else 1.0)
+                t3 = relogio()
+                glfw.swap_buffers(self.window)
+                self.sujo = False
+                self.medidor.registra(t0, t1 - t0, t2 - t1, t3 - t2, relogio() - t3)
+                if self.metricas is not None:
+                    self.metricas.registra(estadoAtual, t0, ativo)
+            if self.metricas is not None:
+                self.metricas.periodico(t2)
+
+    def mede_cpu_ocioso(self, segundos=5.0):
+        """Roda o loop parado em IDLE por alguns segundos e devolve o uso de CPU (% de um núcleo)."""
+        reset_estado()
+        self.sujo = True
+        cpu0, t0 = time.process_time(), time.perf_counter()
+        self._loop(segundos)
+        return 100.0 * (time.process_time() - cpu0) / (time.perf_counter() - t0)
 
     # ------------- Atualiza lógica/estados ----------- #
-    def update(self):
-        color = None
-        global estadoAtual, progressoAnimacao, mensagem_angulo
-        global mensagem_x, mensagem_y, waypoint_idx, segment_start_x, segment_start_y, acquired_colors, current_msg
-
-        if ESTADOS["APLICACAO"] <= estadoAtual <= ESTADOS["FISICA"]:
-            progressoAnimacao += velocidadeAnimacao
-            if progressoAnimacao >= 1.0:
-                progressoAnimacao = 0.0
-                estadoAtual += 1
-                if estadoAtual == ESTADOS["MOVE"]:
-                    segment_start_x = mensagem_x
-                    segment_start_y = mensagem_y
-
-        elif estadoAtual == ESTADOS["MOVE"]:
-            # -------------------------------------------------
-            # 1. mover enquanto NAO chegou
-            # -------------------------------------------------
-            if waypoint_idx < len(waypoints):
-                tx, ty, color, msg = waypoints[waypoint_idx]
-                progressoAnimacao += velocidadeAnimacao
-                mensagem_x = segment_start_x + (tx - segment_start_x) * progressoAnimacao
-                mensagem_y = segment_start_y + (ty - segment_start_y) * progressoAnimacao
-
-                # rotação só durante o trecho horizontal
-                if segment_start_y == y_positions[0] and ty == y_positions[0] \
-                and segment_start_x != tx:
-                    mensagem_angulo = (mensagem_angulo + velocidade_rot) % 360
-                else:
-                    mensagem_angulo = 0.0
-
-            # -------------------------------------------------
-            if progressoAnimacao >= 1.0:
-                progressoAnimacao = 0.0
-                current_msg = msg            # <-- OK, color existe aqui
-
-                if color is not None:
-                    acquired_colors.append(color)
-                else:                        # color é None
-                    if tx == destino_x and acquired_colors:
-                        acquired_colors.pop()
-
-                # actualiza para o próximo segmento
-                waypoint_idx += 1
-                segment_start_x, segment_start_y = mensagem_x, mensagem_y
-
-                if waypoint_idx == len(waypoints):
-                    estadoAtual = ESTADOS["DFISICA"]
-
-
-        elif ESTADOS["DFISICA"] <= estadoAtual <= ESTADOS["DTRANSPORTE"]:
-            progressoAnimacao += velocidadeAnimacao
-            if progressoAnimacao >= 1.0:
-                progressoAnimacao = 0.0
-
-            # ---------- remove o anel mais externo ----------
-            if color is None and segment_start_x == destino_x:    # já estamos no PC direito
-                if acquired_colors:               # ainda há algo a remover
-                    acquired_colors.pop()     # último da lista = borda externa
-            # -------------------------------------------------
-
-                estadoAtual += 1
-                if estadoAtual == ESTADOS["DONE"]:
-                    estadoAtual = ESTADOS["IDLE"]
-                    mensagem_x = mensagem_start_x
-                    mensagem_y = y_positions[4]
-                    waypoint_idx = 0
-                    acquired_colors = [VERDE]
+    def update(self, dt=PASSO_SIM):
+        global estadoAtual, passoAnimacao
+        self.trafego.update(dt / PASSO_SIM)
+        if estadoAtual == ESTADOS["IDLE"]:
+            return
+        passoAnimacao += dt / PASSO_SIM
+        p = int(passoAnimacao + 1e-6)
+        estadoAtual = self.linha.estado_em(p) if p < self.linha.total else ESTADOS["IDLE"]
 
     # ------------------ Desenha cena ------------------ #
-    def render(self):
-        glClear(GL_COLOR_BUFFER_BIT)
+    def render(self, alfa=1.0):
+        self.renderer.estado.novo_frame()
+
+        # fundo (no lugar do glClear): topologia + telas da aula, ou os textos do IDLE
+        if estadoAtual != ESTADOS["IDLE"]:
+            # tudo sai da linha do tempo: etapa do passo atual + pose interpolada
+            k = self.linha.etapa(int(passoAnimacao + 1e-6))
+            t = max(passoAnimacao - (1.0 - alfa), self.linha.inicio[k])   # entre o passo anterior e o atual
+            x, y, angulo, escala = self.linha.pose(t, k)
+            escala *= self.topologia.escala
+            self.renderer.desenha_fundo(self.topologia, self.linha.tela_esq[k], self.linha.tela_dir[k])
+            self.renderer.desenha_mensagem(x, y, self.linha.camadas[k], rot=angulo, scale=escala)
+        else:
+            self.renderer.desenha_fundo(self.topologia, textos=TEXTOS_IDLE)
+
+        if self.trafego.n:
+            self.trafego.prepara(1.0 - alfa)
+            self.renderer.desenha_pacotes(self.trafego)
+
+        if estadoAtual != ESTADOS["IDLE"] and self.linha.legendas[k]:
+            self.renderer.escreve_texto(80, 550, self.linha.legendas[k])
+
+        if self.pausado and estadoAtual != ESTADOS["IDLE"]:
+            self.renderer.desenha_barra(passoAnimacao / self.linha.total, self.marcas)
+        if self.hud_ligado:
+            self.renderer.desenha_hud(self.medidor, self.renderer.estado.objetos)
+        self.renderer.flush()
+
+    # ------------- Instrumentação (tecla I) ------------- #
+    def alterna_instrumentacao(self):
+        if self.instr is None:
+            self.instr = Instrumentacao(self)
+        if self.instr.ativo:
+            self.instr.desliga()
+            print(self.instr.relatorio())
+        else:
+            self.instr.zera()
+            self.instr.liga()
+            print("Contando chamadas GL… (I de novo para o relatório)")
 
-        ativo_esq = ESTADOS["APLICACAO"] <= estadoAtual <= ESTADOS["FISICA"]
-        ativo_dir = estadoAtual != ESTADOS["IDLE"] and estadoAtual >= ESTADOS["MOVE"]
+    # janela redimensionada: viewport e camada de fundo no tamanho novo
+    def resize_callback(self, window, largura, altura):
+        if largura and altura:                 # minimizada: 0×0, nada a fazer
+            glViewport(0, 0, largura, altura)
+            self.renderer.tamanho = (largura, altura)
+            self.sujo = True
 
-        self.renderer.desenha_pc(150, 300, 1.0, ativo_esq)
-        self.renderer.desenha_pc(650, 300, 1.0, ativo_dir)
+    # ---------------- Callback de teclado ------------- #
 
-        if estadoAtual == ESTADOS["MOVE"]:
-            self.renderer.desenha_mensagem(mensagem_x, mensagem_y, acquired_colors, rot=mensagem_angulo)
-        if current_msg:
-            self.renderer.escreve_texto(80, 550, current_msg)
-        else:
-            def cores_por_estado(st):
-                if st in (ESTADOS["APLICACAO"], ESTADOS["DTRANSPORTE"]): return [VERDE]
-                if st in (ESTADOS["TRANSPORTE"], ESTADOS["DREDE"]): return [AZUL, VERDE]
-                if st in (ESTADOS["REDE"], ESTADOS["DENLACE"]): return [AMARELO, AZUL, VERDE]
-                if st in (ESTADOS["ENLACE"], ESTADOS["DFISICA"]): return [VERMELHO, AMARELO, AZUL, VERDE]
-                if st in (ESTADOS["FISICA"], ESTADOS["MOVE"]): return [MAGENTA, VERMELHO, AMARELO, AZUL, VERDE]
-                return []
-
-            if estadoAtual != ESTADOS["IDLE"]:
-               self.renderer.desenha_mensagem(mensagem_x, mensagem_y, [VERDE])
-                # textos por estado (bloco original)
-           
-            elif estadoAtual == ESTADOS["IDLE"]:
-                self.renderer.escreve_texto(200, 500, "Pressione ESPACO para iniciar a animacao")
-                self.renderer.escreve_texto(150, 470, "Visualizacao do encapsulamento de pacotes")
+    def refresh_callback(self, window):
+        self.sujo = True
+
+    def mouse_callback(self, window, botao, action, mods):
+        if botao != glfw.MOUSE_BUTTON_LEFT or action != glfw.PRESS:
+            return
+        if not self.pausado or estadoAtual == ESTADOS["IDLE"]:
+            return
+        cx, cy = glfw.get_cursor_pos(window)
+        larg, alt = glfw.get_window_size(window)             # a cena estica junto com a janela
+        cx, cy = cx * WINDOW_WIDTH / larg, cy * WINDOW_HEIGHT / alt
+        if abs((WINDOW_HEIGHT - cy) - BARRA_Y) <= 8:         # cursor tem y para baixo
+            fracao = min(max((cx - BARRA_X0) / BARRA_LARG, 0.0), 1.0)
+            self.vai_para(min(round(fracao * self.linha.total), self.linha.total - 1))
 
-    # ---------------- Callback de teclado ------------- #
     def key_callback(self, window, key, scancode, action, mods):
-        global estadoAtual, progressoAnimacao, mensagem_x, mensagem_y, waypoint_idx, acquired_colors
         if action != glfw.PRESS: 
             return
+        self.sujo = True
         if key == glfw.KEY_SPACE and estadoAtual == ESTADOS["IDLE"]:
-            estadoAtual = ESTADOS["APLICACAO"]
-            progressoAnimacao = 0.0
-            mensagem_x = mensagem_start_x
-            mensagem_y = y_positions[4]
-            waypoint_idx = 0
-            acquired_colors = [VERDE]
+            self.inicia()
+        elif key == glfw.KEY_P:
+            self.pausado = not self.pausado
         elif key == glfw.KEY_R:
-            reset_estado() 
+            reset_estado()
+        elif key == glfw.KEY_I:
+            self.alterna_instrumentacao()
+        elif key == glfw.KEY_T:
+            if self.instr is None or not self.instr.ativo:
+                self.alterna_instrumentacao()
+            self.instr.traca()
+        elif key in (glfw.KEY_LEFT, glfw.KEY_RIGHT) and estadoAtual != ESTADOS["IDLE"]:
+            passos = BUSCA_PASSOS * (10 if mods & glfw.MOD_SHIFT else 1)
+            self.vai_para(int(passoAnimacao) + (passos if key == glfw.KEY_RIGHT else -passos))
+        elif key == glfw.KEY_HOME and estadoAtual != ESTADOS["IDLE"]:
+            self.vai_para(0)
+        elif key == glfw.KEY_N:
+            i = QUANTIDADES_TRAFEGO.index(self.trafego.n) if self.trafego.n in QUANTIDADES_TRAFEGO else 0
+            self.trafego.quantidade(QUANTIDADES_TRAFEGO[(i + 1) % len(QUANTIDADES_TRAFEGO)])
+            print(f"Tráfego: {self.trafego.n} pacotes")
+        elif key == glfw.KEY_H:
+            self.hud_ligado = not self.hud_ligado
         elif key == glfw.KEY_ESCAPE:
             glfw.set_window_should_close(window, True)
 
 # ----------------------- Função main ----------------------- #
-def main():
-    app = Application()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Encapsulamento de pacotes na rede")
+    parser.add_argument("--bench-ocioso", type=float, metavar="SEG",
+                        help="mede o uso de CPU parado em IDLE por SEG segundos e sai")
+    parser.add_argument("--pacotes", type=int, default=0, metavar="N",
+                        help="começa com N pacotes de tráfego na tela (tecla N alterna)")
+    parser.add_argument("--topologia", metavar="ARQ",
+                        help="JSON com hosts, switches, roteadores e enlaces (padrão: topologia_trab6.json)")
+    parser.add_argument("--laboratorio", type=int, metavar="SALAS",
+                        help="gera uma topologia de laboratório com SALAS salas de 24 hosts")
+    parser.add_argument("--metricas-json", metavar="ARQ",
+                        help="grava periodicamente as métricas de frame neste JSON")
+    parser.add_argument("--metricas-prom", metavar="ARQ",
+                        help="idem, no formato textfile do node-exporter (*.prom)")
+    parser.add_argument("--metricas-intervalo", type=float, default=INTERVALO_ESCRITA, metavar="SEG",
+                        help=f"segundos entre gravações (padrão {INTERVALO_ESCRITA:g})")
+    args = parser.parse_args(argv)
+
+    topologia = None
+    if args.topologia:
+        topologia = Topologia.carrega(args.topologia)
+    elif args.laboratorio:
+        topologia = laboratorio(args.laboratorio)
+    app = Application(topologia)
     try:
+        if args.bench_ocioso:
+            if app.init():
+                cpu = app.mede_cpu_ocioso(args.bench_ocioso)
+                glfw.terminate()
+                print(f"CPU em IDLE: {cpu:.1f}% de um núcleo")
+            return 0
         if app.init():
-            app.run()          # run() já encerra o GLFW no finally
+            app.trafego.quantidade(args.pacotes)
+            metricas = None
+            if args.metricas_json or args.metricas_prom:
+                metricas = MetricasFrames(ESTADOS, args.metricas_json, args.metricas_prom,
+                                          args.metricas_intervalo, relogio=app.relogio)
+            app.run(metricas=metricas)   # run() já encerra o GLFW no finally
     except KeyboardInterrupt:
         print("\nInterrompido pelo usuário.")   # sai silenciosamente
     return 0
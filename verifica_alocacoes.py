@@ -0,0 +1,87 @@
+"""
+Confere que o frame em regime (update + render) não aloca memória líquida.
+
+Roda trab6 (ou outro trab*) contra o glstub: um ciclo IDLE → … → IDLE de
+aquecimento (enche os caches de texto) e depois um ciclo medido sob
+tracemalloc, contando também as coletas do GC e o pico de memória dentro de
+cada frame (temporários que somem no fim do frame não aparecem no líquido).
+
+uso: python verifica_alocacoes.py [modulo] [limite_bytes_por_frame] [limite_pico]
+
+Falha se passar do limite líquido, se o pico de algum frame passar do
+limite de pico ou se o GC rodar alguma coleta durante o ciclo medido. O
+limite líquido padrão (8 bytes/frame) fica abaixo de um único objeto Python
+vazado por frame; o que sobra são caches internos do NumPy, de tamanho fixo.
+O de pico (PICO_PADRAO) cobre os temporários NumPy do frame, que são
+pequenos e de tamanho fixo.
+"""
+import gc
+import sys
+import tracemalloc
+
+import glstub
+
+MAX_FRAMES  = 50000
+PICO_PADRAO = 4 * 1024       # bytes acima do início do frame
+
+
+def ciclo(mod, app, pico=None):
+    """
+    Inicia a animação e roda até voltar para IDLE. Devolve o nº de frames.
+    Com `pico` (lista de um item, tracemalloc ligado), guarda nele o maior
+    pico de um frame acima da memória do começo daquele frame.
+    """
+    glfw = sys.modules["glfw"]
+    app.key_callback(app.window, glfw.KEY_SPACE, 0, glfw.PRESS, 0)
+    for frames in range(1, MAX_FRAMES + 1):
+        if pico is not None:
+            inicio = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        app.update()
+        app.render()
+        if pico is not None:
+            pico[0] = max(pico[0], tracemalloc.get_traced_memory()[1] - inicio)
+        if mod.estadoAtual == mod.ESTADOS["IDLE"]:
+            return frames
+    return MAX_FRAMES
+
+
+def mede(nome="trab6"):
+    mod = glstub.carrega(nome)
+    app = mod.Application()
+    app.init()
+    ciclo(mod, app)                  # aquecimento
+
+    coletas = [0]
+    def conta(fase, info):
+        if fase == "start":
+            coletas[0] += 1
+    gc.collect()
+    gc.callbacks.append(conta)
+    tracemalloc.start()
+    pico = [0]
+    antes = tracemalloc.get_traced_memory()[0]
+    frames = ciclo(mod, app, pico)
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    gc.callbacks.remove(conta)
+    return {"frames": frames,
+            "bytes_por_frame": (depois - antes) / frames,
+            "pico_frame": pico[0],
+            "coletas_gc": coletas[0]}
+
+
+def main():
+    nome   = sys.argv[1] if len(sys.argv) > 1 else "trab6"
+    limite = float(sys.argv[2]) if len(sys.argv) > 2 else 8.0
+    limite_pico = int(sys.argv[3]) if len(sys.argv) > 3 else PICO_PADRAO
+    r = mede(nome)
+    print(f"{nome}: {r['frames']} frames, {r['bytes_por_frame']:.3f} bytes/frame líquidos, "
+          f"pico de {r['pico_frame']} bytes num frame, {r['coletas_gc']} coletas do GC")
+    ok = (r["bytes_por_frame"] <= limite and r["pico_frame"] <= limite_pico
+          and r["coletas_gc"] == 0)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Escritores de vídeo em streaming, sem ffmpeg: um quadro entra, vai para o
+disco e só o quadro anterior fica na memória.
+
+  EscritorY4M  -> YUV4MPEG2 4:2:0 cru (BT.601, faixa de estúdio), o formato
+                  que ffmpeg/mpv/x264 leem direto
+  EscritorAPNG -> PNG animado; cada quadro só grava o retângulo que mudou
+
+Os dois recebem arrays (altura, largura, 3 ou 4) uint8 com a linha 0 no
+topo, como os de offscreen.Headless.quadros(); o alfa é ignorado.
+"""
+import struct
+import zlib
+
+import numpy as np
+
+from exporta import ASSINATURA_PNG, NIVEL_PADRAO, chunk_png
+
+BUFFER_ESCRITA = 1 << 22    # 4 MiB: poucas syscalls grandes em vez de muitas pequenas
+
+# BT.601 "studio swing": linhas = Y, Cb, Cr; colunas = R, G, B (entrada 0–255)
+BT601 = np.array([[ 65.481, 128.553,  24.966],
+                  [-37.797, -74.203, 112.000],
+                  [112.000, -93.786, -18.214]], dtype=np.float32) / 255.0
+BT601_DESLOC = np.array([16.0, 128.0, 128.0], dtype=np.float32)
+
+
+# ============================================================ #
+#                          YUV4MPEG2                           #
+# ============================================================ #
+class EscritorY4M:
+    """
+    Converte RGB → Y'CbCr 4:2:0 em NumPy (buffers alocados uma vez) e
+    grava FRAME + planos Y, Cb, Cr. A crominância é a média de cada bloco 2×2.
+    """
+    def __init__(self, caminho, largura, altura, fps=60):
+        if largura % 2 or altura % 2:
+            raise ValueError("4:2:0 precisa de largura e altura pares")
+        self.largura, self.altura = largura, altura
+        self.arq = open(caminho, "wb", buffering=BUFFER_ESCRITA)
+        self.arq.write(f"YUV4MPEG2 W{largura} H{altura} F{fps}:1 Ip A1:1 C420jpeg\n".encode("ascii"))
+        self.quadros = 0
+        hc, wc = altura // 2, largura // 2
+        self._rgb   = np.empty((altura, largura, 3), dtype=np.float32)
+        self._yuv   = np.empty((altura, largura, 3), dtype=np.float32)
+        self._soma  = np.empty((hc, wc, 2), dtype=np.float32)
+        self._y     = np.empty((altura, largura), dtype=np.uint8)
+        self._cbcr  = np.empty((2, hc, wc), dtype=np.uint8)
+
+    def escreve(self, quadro):
+        self._rgb[...] = quadro[..., :3]
+        np.matmul(self._rgb, BT601.T, out=self._yuv)
+        self._yuv += BT601_DESLOC
+        self._yuv += 0.5                                   # arredonda no truncamento abaixo
+        np.clip(self._yuv, 0.0, 255.0, out=self._yuv)
+        self._y[...] = self._yuv[..., 0]
+
+        c = self._yuv[..., 1:]
+        np.add(c[0::2, 0::2], c[1::2, 0::2], out=self._soma)
+        self._soma += c[0::2, 1::2]
+        self._soma += c[1::2, 1::2]
+        self._soma *= 0.25
+        self._cbcr[...] = self._soma.transpose(2, 0, 1)   # intercalado → planar
+
+        self.arq.write(b"FRAME\n")
+        self.arq.write(self._y)
+        self.arq.write(self._cbcr)
+        self.quadros += 1
+
+    def fecha(self):
+        self.arq.close()
+
+
+# ============================================================ #
+#                        PNG animado (APNG)                     #
+# ============================================================ #
+class EscritorAPNG:
+    """
+    APNG RGB em streaming. O primeiro quadro vai inteiro (IDAT); os outros
+    só com o retângulo que mudou em relação ao anterior (fdAT, blend SOURCE,
+    dispose NONE). O nº de quadros do acTL é corrigido no fecha(), então o
+    arquivo precisa ser seekable.
+
+    Com dedup, um quadro idêntico ao anterior não é gravado: o último quadro
+    fica pendente na memória e o atraso dele cresce (colapsados conta quantos).
+    """
+    MAX_ATRASO = 0xFFFF     # delay_num do fcTL é de 16 bits
+
+    def __init__(self, caminho, largura, altura, fps=60, nivel=NIVEL_PADRAO, dedup=False):
+        self.largura, self.altura = largura, altura
+        self.fps, self.nivel = fps, nivel
+        self.dedup      = dedup
+        self.colapsados = 0
+        self._pendente  = None      # [x0, y0, w, h, atraso, dados] do último quadro distinto
+        self.arq = open(caminho, "wb", buffering=BUFFER_ESCRITA)
+        self.arq.write(ASSINATURA_PNG)
+        self.arq.write(chunk_png(b"IHDR", struct.pack(">IIBBBBB", largura, altura, 8, 2, 0, 0, 0)))
+        self._pos_actl = self.arq.tell()
+        self.arq.write(chunk_png(b"acTL", struct.pack(">II", 0, 0)))
+        self.quadros = 0
+        self.seq     = 0
+        self.bytes_quadros = 0
+        self.anterior = np.zeros((altura, largura, 3), dtype=np.uint8)
+        self._mudou   = np.empty((altura, largura, 3), dtype=bool)
+        self._linhas  = np.zeros(altura * (1 + largura * 3), dtype=np.uint8)
+
+    def _retangulo(self, rgb):
+        # (x0, y0, x1, y1) dos pixels diferentes do quadro anterior; None se nada mudou
+        if self.quadros == 0 and self._pendente is None:
+            return 0, 0, self.largura, self.altura
+        np.not_equal(rgb, self.anterior, out=self._mudou)
+        linhas = np.flatnonzero(self._mudou.any(axis=(1, 2)))
+        if not len(linhas):
+            return None
+        colunas = np.flatnonzero(self._mudou[linhas[0]:linhas[-1] + 1].any(axis=(0, 2)))
+        return colunas[0], linhas[0], colunas[-1] + 1, linhas[-1] + 1
+
+    def escreve(self, quadro, atraso=1):
+        """Grava um quadro que fica atraso/fps segundos na tela."""
+        rgb = quadro[..., :3]
+        ret = self._retangulo(rgb)
+        if ret is None:
+            if self.dedup and self._pendente[4] + atraso <= self.MAX_ATRASO:
+                self._pendente[4] += atraso
+                self.colapsados += 1
+                return
+            ret = (0, 0, 1, 1)      # o APNG não aceita quadro vazio: repete um pixel
+        x0, y0, x1, y1 = ret
+        w, h = x1 - x0, y1 - y0
+        regiao = rgb[y0:y1, x0:x1]
+        linhas = self._linhas[:h * (1 + w * 3)].reshape(h, 1 + w * 3)
+        linhas[:, 0] = 0
+        linhas[:, 1:] = regiao.reshape(h, -1)
+        dados = zlib.compress(linhas, self.nivel)
+        self.anterior[y0:y1, x0:x1] = regiao
+        self._grava_pendente()
+        self._pendente = [x0, y0, w, h, atraso, dados]
+
+    def _grava_pendente(self):
+        if self._pendente is None:
+            return
+        x0, y0, w, h, atraso, dados = self._pendente
+        fctl = struct.pack(">IIIIIHHBB", self.seq, w, h, x0, y0, atraso, self.fps, 0, 0)
+        self.seq += 1
+        self.arq.write(chunk_png(b"fcTL", fctl))
+        if self.quadros == 0:
+            self.arq.write(chunk_png(b"IDAT", dados))
+        else:
+            self.arq.write(chunk_png(b"fdAT", struct.pack(">I", self.seq) + dados))
+            self.seq += 1
+        self.bytes_quadros += len(dados)
+        self.quadros += 1
+        self._pendente = None
+
+    def fecha(self):
+        self._grava_pendente()
+        self.arq.write(chunk_png(b"IEND", b""))
+        self.arq.seek(self._pos_actl)
+        self.arq.write(chunk_png(b"acTL", struct.pack(">II", self.quadros, 0)))   # 0 = repete sempre
+        self.arq.close()
+
+
+FORMATOS = {"y4m": EscritorY4M, "apng": EscritorAPNG}